@@ -1,8 +1,13 @@
 """somesy package."""
 
-from typing import Final
 
-import importlib_metadata
+def __getattr__(name: str):
+    # NOTE: the version is resolved lazily (PEP 562) to keep the CLI startup fast
+    if name == "__version__":
+        import importlib_metadata
 
-# Set version, it will use version from pyproject.toml if defined
-__version__: Final[str] = importlib_metadata.version(__package__ or __name__)
+        # Set version, it will use version from pyproject.toml if defined
+        version = importlib_metadata.version(__package__ or __name__)
+        globals()["__version__"] = version
+        return version
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,189 @@
+"""Batch creation of many repositories from a single manifest."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from pydantic import BaseModel
+from pydantic_yaml import parse_yaml_file_as
+from typing_extensions import Self
+
+from .config import CookiecutterConfig, CookiecutterJson, FPCConfig
+from .main import check_prerequisites, finalize_repository, preview_repository
+from .preview import ProjectManifest
+from .utils import render_template
+
+
+class BatchResult(BaseModel):
+    """Outcome of creating one repository of a batch."""
+
+    project_slug: str
+    path: Optional[Path] = None
+    error: Optional[str] = None
+    manifest: Optional[ProjectManifest] = None
+    """Generated files (only for previews)."""
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class BatchManifest(BaseModel):
+    """Model for a batch manifest file.
+
+    Instead of a mapping, a manifest file may also contain just the list of projects.
+    """
+
+    output_dir: Optional[Path] = None
+    """Directory where the projects are created (relative to the manifest location)."""
+
+    projects: List[Dict[str, Any]]
+    """Overrides of `FPCConfig` values, one entry per project to be created."""
+
+    @classmethod
+    def load(cls, path: Path) -> Self:
+        """Load a manifest from a YAML file."""
+        manifest = parse_yaml_file_as(Union[cls, List[Dict[str, Any]]], path)
+        if not isinstance(manifest, cls):
+            manifest = cls(projects=manifest)
+        if manifest.output_dir:
+            manifest.output_dir = Path(path).parent / manifest.output_dir
+        return manifest
+
+
+def parse_shard(shard: str) -> Tuple[int, int]:
+    """Parse a shard specification 'i/n' (with 1 <= i <= n)."""
+    try:
+        idx, cnt = map(int, shard.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{shard}', expected format: i/n") from None
+    if not 1 <= idx <= cnt:
+        raise ValueError(f"Invalid shard '{shard}', must satisfy 1 <= i <= n!")
+    return idx, cnt
+
+
+def select_shard(items: List[Any], shard: Optional[Tuple[int, int]]) -> List[Any]:
+    """Return the part of the list belonging to the given shard (round-robin)."""
+    if not shard:
+        return items
+    idx, cnt = shard
+    return items[idx - 1 :: cnt]
+
+
+def configure(
+    base: CookiecutterConfig, overrides: Dict[str, Any]
+) -> CookiecutterConfig:
+    """Return a copy of the base config with the given overrides applied.
+
+    Raises ValueError (or ValidationError, listing all invalid values) on failure.
+    """
+    # like --repo-url in the CLI, the URL pre-fills values that can still be overridden
+    pconf = FPCConfig.from_overrides(base.fair_python_cookiecutter, overrides)
+    return base.model_copy(update=dict(fair_python_cookiecutter=pconf))
+
+
+Jobs = Dict[str, Tuple[CookiecutterConfig, CookiecutterJson]]
+
+
+def _configure_all(
+    base: CookiecutterConfig, manifest: List[Dict[str, Any]]
+) -> Tuple[List[BatchResult], Jobs]:
+    """Configure all projects, returns results of invalid entries and the valid jobs."""
+    results: List[BatchResult] = []
+    jobs: Jobs = {}
+    for i, overrides in enumerate(manifest):
+        try:
+            conf = configure(base, overrides)
+            cc_json = CookiecutterJson.from_config(conf)
+        except ValueError as e:  # NOTE: includes pydantic ValidationError
+            slug = overrides.get("project_slug") or f"#{i}"
+            results.append(BatchResult(project_slug=slug, error=str(e)))
+            continue
+        if cc_json.project_slug in jobs:
+            err = "Duplicate project in manifest!"
+            results.append(BatchResult(project_slug=cc_json.project_slug, error=err))
+            continue
+        jobs[cc_json.project_slug] = (conf, cc_json)
+    return results, jobs
+
+
+def preview_repositories(
+    base: CookiecutterConfig, manifest: List[Dict[str, Any]], output_dir: Path
+) -> List[BatchResult]:
+    """Render all projects of the manifest in memory, returns per-project results.
+
+    Nothing is written, the results contain the manifests of the generated files.
+    """
+    results, jobs = _configure_all(base, manifest)
+    for slug, (conf, _) in jobs.items():
+        try:
+            repo_dir, files = preview_repository(conf, output_dir)
+        except Exception as e:  # NOTE: e.g. errors in the template
+            results.append(BatchResult(project_slug=slug, error=str(e)))
+            continue
+        res_manifest = ProjectManifest.from_files(repo_dir, files)
+        results.append(
+            BatchResult(project_slug=slug, path=repo_dir, manifest=res_manifest)
+        )
+    return results
+
+
+def _render(cc_json: CookiecutterJson, output_dir: Path, keep: bool) -> Path:
+    """Render one project (runs in a worker process)."""
+    return render_template(
+        cc_json, output_dir, accept_hooks=True, keep_project_on_failure=keep
+    )
+
+
+def create_repositories(
+    base: CookiecutterConfig,
+    manifest: List[Dict[str, Any]],
+    output_dir: Path,
+    *,
+    workers: Optional[int] = None,
+    render_workers: Optional[int] = None,
+    keep_on_fail: bool = False,
+) -> List[BatchResult]:
+    """Create a repository for each entry of the manifest, returns per-project results.
+
+    All projects are rendered in a process pool from the package template,
+    then at most `workers` repositories are finalized concurrently.
+    """
+    results, jobs = _configure_all(base, manifest)
+    if not jobs:
+        return results
+
+    check_prerequisites()
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    def finalize(slug: str, repo_dir: Path) -> BatchResult:
+        # projects are finalized concurrently, so their messages are prefixed
+        finalize_repository(repo_dir, jobs[slug][0], name=slug)
+        return BatchResult(project_slug=slug, path=repo_dir)
+
+    renderers = ProcessPoolExecutor(render_workers)
+    finalizers = ThreadPoolExecutor(workers or min(4, os.cpu_count() or 1))
+    with renderers, finalizers:
+        rendering = {
+            renderers.submit(_render, cc_json, output_dir, keep_on_fail): slug
+            for slug, (_, cc_json) in jobs.items()
+        }
+        finalizing = {}
+        for fut in as_completed(rendering):
+            slug = rendering[fut]
+            try:
+                repo_dir = fut.result()
+            except Exception as e:
+                results.append(BatchResult(project_slug=slug, error=str(e)))
+                continue
+            finalizing[finalizers.submit(finalize, slug, repo_dir)] = slug
+
+        for fut in as_completed(finalizing):
+            slug = finalizing[fut]
+            try:
+                results.append(fut.result())
+            except Exception as e:
+                results.append(BatchResult(project_slug=slug, error=str(e)))
+
+    return results
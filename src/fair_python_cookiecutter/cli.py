@@ -1,23 +1,45 @@
-"""Main entry point for the somesy CLI."""
+"""Main entry point for the somesy CLI.
 
+NOTE: To keep the startup fast (e.g. for --help), heavy modules
+are only imported in the code paths where they are needed.
+"""
+
+import json
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, List, Optional
 
 import typer
 from rich import print
-from rich.panel import Panel
-from rich.prompt import Confirm
-from rich.rule import Rule
+from typer.core import TyperGroup
 from typing_extensions import Annotated
 
-from . import __version__
-from .config import CookiecutterConfig, CookiecutterJson
-from .main import create_repository
+if TYPE_CHECKING:  # pragma: no cover
+    from .config import CookiecutterConfig
 
 logger = logging.getLogger("fair_python_cookiecutter")
 
-app = typer.Typer()
+
+class DefaultCommandGroup(TyperGroup):
+    """Group that runs the `main` command, unless another command is requested.
+
+    This keeps the CLI usable without having to type the name of the main command.
+    The command names are reserved, so an output directory with such a name must be
+    given as a path (e.g. `./update`). If it is ambiguous, nothing is run.
+    """
+
+    def parse_args(self, ctx, args):
+        """Prepend the main command, if arguments do not start with a command name."""
+        if not args or args[0] not in self.commands:
+            args = ["main", *args]
+        elif Path(args[0]).exists():
+            msg = f"'{args[0]}' is a command, but also exists in this directory."
+            msg += f" Use './{args[0]}' to refer to the directory!"
+            ctx.fail(msg)
+        return super().parse_args(ctx, args)
+
+
+app = typer.Typer(cls=DefaultCommandGroup)
 
 
 FIRST_TIME_NOTE = """[b]Welcome![/b] It looks like this is the first time you are using this tool.
@@ -37,7 +59,7 @@ Do you want to save these settings?"""
 
 
 def infer_from_args(
-    ccconf: CookiecutterConfig, repo_url: str = "", output_dir: Optional[Path] = None
+    ccconf: "CookiecutterConfig", repo_url: str = "", output_dir: Optional[Path] = None
 ):
     """Infer some values based on passed CLI arguments, returns output_dir value."""
     if repo_url:
@@ -48,7 +70,7 @@ def infer_from_args(
     return Path(".")
 
 
-def prompt_config(ccconf: CookiecutterConfig):
+def prompt_config(ccconf: "CookiecutterConfig"):
     """Prompt user to confirm or update all values set for template variables."""
     # ask user for a repo url first if missing (can extract lots of info from it)
     repo_url = ccconf.fair_python_cookiecutter.project_repo_url
@@ -64,8 +86,148 @@ def prompt_config(ccconf: CookiecutterConfig):
         ccconf.fair_python_cookiecutter.infer_repo_url()
 
 
+def run_batch(
+    ccconf: "CookiecutterConfig",
+    manifest_file: Path,
+    *,
+    shard: Optional[str] = None,
+    workers: Optional[int] = None,
+    dry_run: bool = False,
+    keep_on_fail: bool = False,
+    files_manifest: Optional[Path] = None,
+):
+    """Create all projects listed in a manifest file and print a summary."""
+    from rich.table import Table
+
+    from .batch import (
+        BatchManifest,
+        create_repositories,
+        parse_shard,
+        preview_repositories,
+        select_shard,
+    )
+
+    try:
+        manifest = BatchManifest.load(manifest_file)
+        projects = select_shard(manifest.projects, shard and parse_shard(shard))
+    except ValueError as e:
+        print(f"[red]{e}[/red]")
+        raise typer.Exit(1) from e
+    output_dir = manifest.output_dir or Path(".")
+
+    if dry_run:
+        results = preview_repositories(ccconf, projects, output_dir)
+    else:
+        results = create_repositories(
+            ccconf, projects, output_dir, workers=workers, keep_on_fail=keep_on_fail
+        )
+
+    table = Table("Project", "Status", "Details", title="Batch Summary")
+    for res in sorted(results, key=lambda r: r.project_slug):
+        status = "[green]OK[/green]" if res.ok else "[red]FAILED[/red]"
+        details = res.error
+        if res.manifest:
+            details = f"{res.path} ({len(res.manifest.files)} files, {res.manifest.total_size()} bytes)"
+        elif res.ok:
+            details = str(res.path)
+        table.add_row(res.project_slug, status, details)
+    print(table)
+
+    if files_manifest:
+        manifests = [
+            res.manifest.model_dump(mode="json") for res in results if res.manifest
+        ]
+        files_manifest.write_text(json.dumps(manifests, indent=2))
+        print(f"[i]Manifest of generated files was saved in {files_manifest}[/i]")
+
+    if not all(res.ok for res in results):
+        raise typer.Exit(1)
+
+
+def show_preview(
+    ccconf: "CookiecutterConfig",
+    output_dir: Path,
+    *,
+    files_manifest: Optional[Path] = None,
+    diff_dir: Optional[Path] = None,
+):
+    """Render the project in memory and show the resulting files (or differences)."""
+    from rich.markup import escape
+    from rich.table import Table
+
+    from .main import preview_repository
+    from .preview import ProjectManifest, diff_project
+
+    try:
+        repo_dir, files = preview_repository(ccconf, output_dir)
+    except Exception as e:  # NOTE: e.g. errors in the template
+        print(f"[red]Rendering the project failed: {escape(str(e))}[/red]")
+        raise typer.Exit(1) from e
+    manifest = ProjectManifest.from_files(repo_dir, files)
+
+    if diff_dir:
+        if diff := diff_project(files, diff_dir):
+            typer.echo(diff, nl=False)  # NOTE: not cropped or styled, like a patch
+        else:
+            print(f"[green]No differences to {diff_dir}[/green]")
+    else:
+        table = Table("File", "Size", "SHA-256", title=f"Files of {repo_dir}")
+        for entry in manifest.files:
+            table.add_row(entry.path, str(entry.size), entry.sha256[:16])
+        print(table)
+        print(f"{len(manifest.files)} files, {manifest.total_size()} bytes")
+
+    if files_manifest:
+        files_manifest.write_text(manifest.model_dump_json(indent=2))
+        print(f"[i]Manifest of generated files was saved in {files_manifest}[/i]")
+
+
+def run_profiled(
+    ccconf: "CookiecutterConfig",
+    output_dir: Path,
+    *,
+    keep_on_fail: bool,
+    report_file: Path,
+    stats_file: Optional[Path],
+):
+    """Create the repository, measuring and reporting the time spent in each phase."""
+    from . import profiling
+    from .main import create_repository
+
+    profiler = profiling.Profiler(cprofile=stats_file is not None)
+    try:
+        with profiling.activate(profiler), profiler.phase("create_repository"):
+            create_repository(ccconf, output_dir, keep_on_fail=keep_on_fail)
+    finally:
+        # also (or especially) useful if something went wrong
+        print(profiler.table())
+        profiler.save_report(report_file)
+        print(f"[i]Timings were saved in {report_file}[/i]")
+        if stats_file:
+            profiler.save_stats(stats_file)
+            print(f"[i]cProfile stats were saved in {stats_file}[/i]")
+
+
+def version_callback(value: bool):
+    """Print the version of the tool and exit."""
+    if value:
+        from . import __version__
+
+        typer.echo(__version__)  # NOTE: avoids loading rich console
+        raise typer.Exit()
+
+
 @app.command()
 def main(
+    version: Annotated[
+        Optional[bool],
+        typer.Option(
+            "--version",
+            callback=version_callback,
+            is_eager=True,
+            help="Show the version and exit.",
+        ),
+    ] = None,
     dry_run: bool = False,
     no_input: bool = False,
     config_file: Annotated[
@@ -81,22 +243,113 @@ def main(
         ),
     ] = None,
     keep_project_on_failure: bool = False,
+    batch: Annotated[
+        Optional[Path],
+        typer.Option(
+            exists=True,
+            dir_okay=False,
+            help="YAML manifest with settings for many projects to create at once.",
+        ),
+    ] = None,
+    shard: Annotated[
+        Optional[str],
+        typer.Option(
+            help="Only create the i-th of n parts of the batch (format: i/n)."
+        ),
+    ] = None,
+    workers: Annotated[
+        Optional[int],
+        typer.Option(min=1, help="Maximum number of projects finalized in parallel."),
+    ] = None,
+    manifest: Annotated[
+        Optional[Path],
+        typer.Option(
+            dir_okay=False,
+            help="Write a JSON manifest of all generated files (implies --dry-run).",
+        ),
+    ] = None,
+    diff: Annotated[
+        Optional[Path],
+        typer.Option(
+            exists=True,
+            file_okay=False,
+            help="Show the differences to an existing project directory (implies --dry-run).",
+        ),
+    ] = None,
+    profile: Annotated[
+        bool, typer.Option(help="Measure the time spent in each creation phase.")
+    ] = False,
+    profile_report: Annotated[
+        Path, typer.Option(dir_okay=False, help="Where to write the timings (JSON).")
+    ] = Path("fpc-profile.json"),
+    profile_stats: Annotated[
+        Optional[Path],
+        typer.Option(
+            dir_okay=False,
+            help="Where to write cProfile stats of the in-process parts (implies --profile).",
+        ),
+    ] = None,
 ):
-    """Create a new project from the template."""
+    """Create a new project from the template (in OUTPUT_DIR, if given).
+
+    The names of the commands are reserved, use e.g. `./update` to create a project in
+    a directory called `update`. Use the `update` command to update existing projects after the template changed,
+    and `warm-cache` to prepare the creation of projects without network.
+    """
+    from rich.markup import escape
+    from rich.panel import Panel
+    from rich.prompt import Confirm
+    from rich.rule import Rule
+
+    from . import __version__
+    from .config import CookiecutterConfig, CookiecutterJson, FPCConfig
+
     print(Rule(title=f"[b]FAIR Python Cookiecutter[/b] {__version__}"))
 
     # load config (.cookiecutterrc if it exists, or defaults)
     ccconf = CookiecutterConfig.load(config_file=config_file)
 
+    dry_run = dry_run or manifest is not None or diff is not None
+
+    if batch:
+        if output_dir or repo_url or diff:
+            print("[red]In batch mode, all settings must be in the manifest![/red]")
+            raise typer.Exit(1)
+        if profile or profile_stats:
+            print("[red]Profiling is not supported in batch mode![/red]")
+            raise typer.Exit(1)
+        run_batch(
+            ccconf,
+            batch,
+            shard=shard,
+            workers=workers,
+            dry_run=dry_run,
+            keep_on_fail=keep_project_on_failure,
+            files_manifest=manifest,
+        )
+        return
+
     if ccconf.fair_python_cookiecutter.is_default():
         # show info for new users
         print(Panel.fit(FIRST_TIME_NOTE))
         print(Panel.fit(REPO_URL_NOTE))
 
-    # infer values
-    output_dir = infer_from_args(ccconf, repo_url=repo_url, output_dir=output_dir)
-
-    if not no_input:
+    if no_input:
+        # infer values and check them all at once
+        try:
+            ccconf.fair_python_cookiecutter = FPCConfig.from_overrides(
+                ccconf.fair_python_cookiecutter,
+                repo_url=repo_url,
+                output_dir=output_dir,
+            )
+        except ValueError as e:  # NOTE: includes pydantic ValidationError
+            print(Panel.fit(escape(str(e))))
+            print("[red]The configuration is not valid![/red]")
+            raise typer.Exit(1) from None
+        output_dir = output_dir.parent if output_dir else Path(".")
+    else:
+        # infer values
+        output_dir = infer_from_args(ccconf, repo_url=repo_url, output_dir=output_dir)
         # confirm / complete values
         prompt_config(ccconf)
 
@@ -105,13 +358,90 @@ def main(
             ccconf.save()
             print(f"\n[i]Your settings were saved in {ccconf.config_path()} ![/i]")
 
-    # check values after all the tweaking
-    ccconf.fair_python_cookiecutter.check()
+        # check values after all the tweaking
+        ccconf.fair_python_cookiecutter.check()
 
     if dry_run:
         # show and exit
         print(f"output_dir={output_dir}", ccconf, CookiecutterJson.from_config(ccconf))
+        show_preview(ccconf, output_dir, files_manifest=manifest, diff_dir=diff)
         return
 
     # we're ready to create the repository
-    create_repository(ccconf, output_dir, keep_on_fail=keep_project_on_failure)
+    from .main import create_repository
+    from .pipeline import PipelineError
+
+    try:
+        if profile or profile_stats:
+            run_profiled(
+                ccconf,
+                output_dir,
+                keep_on_fail=keep_project_on_failure,
+                report_file=profile_report,
+                stats_file=profile_stats,
+            )
+        else:
+            create_repository(ccconf, output_dir, keep_on_fail=keep_project_on_failure)
+    except PipelineError as e:
+        print(f"[red]{escape(str(e))}[/red]")
+        raise typer.Exit(1) from e
+
+
+@app.command()
+def warm_cache():
+    """Prepare dependencies and pre-commit hooks, so new projects can be set up offline."""
+    from rich.markup import escape
+
+    from .depcache import DependencyCache, warm_cache
+    from .pipeline import PipelineError
+
+    cache = DependencyCache()
+    try:
+        warm_cache(cache)
+    except PipelineError as e:
+        print(f"[red]{escape(str(e))}[/red]")
+        raise typer.Exit(1) from e
+    print(f"[i]The dependency cache in {cache.path} is ready.[/i]")
+
+
+@app.command()
+def update(
+    project_dirs: Annotated[
+        Optional[List[Path]],
+        typer.Argument(
+            exists=True, file_okay=False, help="Projects to update (default: .)"
+        ),
+    ] = None,
+    dry_run: Annotated[
+        bool, typer.Option(help="Only show what would be changed.")
+    ] = False,
+):
+    """Update generated projects to the current state of the template."""
+    from rich.markup import escape
+    from rich.table import Table
+
+    from .main import update_repository
+    from .pipeline import PipelineError
+
+    failed = False
+    table = Table("Project", "Changed", "Conflicts", "Steps", title="Update Summary")
+    for project_dir in project_dirs or [Path(".")]:
+        try:
+            res = update_repository(project_dir, dry_run=dry_run)
+        except (ValueError, PipelineError) as e:
+            failed = True
+            table.add_row(str(project_dir), f"[red]{escape(str(e))}[/red]", "", "")
+            continue
+        failed = failed or bool(res.conflicts)
+        changes = [f"+{p}" for p in res.added] + [f"~{p}" for p in res.updated]
+        changes += [f"-{p}" for p in res.removed]
+        table.add_row(
+            str(project_dir),
+            "\n".join(changes) or "-",
+            "[red]" + "\n".join(res.conflicts) + "[/red]" if res.conflicts else "-",
+            ", ".join(res.steps) or "-",
+        )
+    print(table)
+
+    if failed:
+        raise typer.Exit(1)
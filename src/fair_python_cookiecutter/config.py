@@ -4,9 +4,6 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
-import spdx_lookup
-from cookiecutter.config import get_user_config
-from cookiecutter.extensions import pyslugify
 from pydantic import (
     AfterValidator,
     BaseModel,
@@ -14,9 +11,9 @@ from pydantic import (
     ConfigDict,
     Field,
     HttpUrl,
+    TypeAdapter,
     ValidationError,
 )
-from pydantic_yaml import to_yaml_file
 from rich import print
 from rich.panel import Panel
 from rich.prompt import Confirm, Prompt
@@ -26,10 +23,14 @@ from . import __version__
 
 
 def to_spdx_license(s: str):
-    if license := spdx_lookup.by_id(s):
-        return license.id
-    else:
-        raise ValueError("Invalid SPDX license id!")
+    from .spdx import lookup_license, suggest_licenses
+
+    if license := lookup_license(s):
+        return license
+    msg = "Invalid SPDX license id!"
+    if suggestions := suggest_licenses(s):
+        msg += f" Did you mean: {', '.join(suggestions)}?"
+    raise ValueError(msg)
 
 
 TODAY = datetime.now()
@@ -43,6 +44,7 @@ Orcid = Annotated[
 OrcidUrl = Annotated[str, Field(pattern=r"^https://orcid.org/(\d{4}-){3}\d{3}(\d|X)$")]
 SemVerStr = Annotated[str, Field(pattern=r"^\d+\.\d+\.\d+$")]
 SPDXLicense = Annotated[str, AfterValidator(to_spdx_license)]
+_HTTP_URL = TypeAdapter(HttpUrl)
 MyHttpUrl = Annotated[
     HttpUrl,
     BeforeValidator(
@@ -191,10 +193,12 @@ class FPCConfig(MyBaseModel):
 
     def is_default(self) -> bool:
         """Return whether the current config consists of only the defaults."""
-        dump_args = dict(
-            exclude_defaults=True, exclude_none=True, mode="json-compliant"
-        )
-        return type(self)().model_dump(**dump_args) == self.model_dump(**dump_args)
+        # NOTE: same as comparing dumps (without None and defaults) with a fresh config
+        for key, fld in type(self).model_fields.items():
+            val = getattr(self, key)
+            if not fld.exclude and val is not None and val != fld.default:
+                return False
+        return True
 
     # project-specific
 
@@ -291,6 +295,12 @@ class FPCConfig(MyBaseModel):
     init_api: bool = Field(
         False, description="Do you want to add example code for a web API service?"
     )
+    init_bench: bool = Field(
+        False, description="Do you want to add benchmarks (with pytest-benchmark)?"
+    )
+    init_profiling: bool = Field(
+        False, description="Do you want to add tasks for profiling time and memory?"
+    )
 
     # derivative values (that are not be overridable by the user)
 
@@ -321,42 +331,111 @@ class FPCConfig(MyBaseModel):
         """Return whether this is GitHub (if it is not, we assume it is a GitLab)."""
         return self.project_hoster.host == "github.com"
 
-    def infer_from_output_dir(self, path: Path):
-        self.project_name = path.name
-        self.project_slug = pyslugify(path.name)
+    @staticmethod
+    def _output_dir_values(path: Path) -> Dict[str, Any]:
+        from cookiecutter.extensions import pyslugify
 
-    def infer_from_repo_url(self, url: Union[str, HttpUrl]):
-        """Infer field values from passed repository URL."""
-        self.project_repo_url = url
-        repo_url: HttpUrl = self.project_repo_url
+        return dict(project_name=path.name, project_slug=pyslugify(path.name))
 
+    @staticmethod
+    def _repo_url_values(
+        repo_url: HttpUrl, pages_domain: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Return field values inferred from a (valid) repository URL."""
+        values: Dict[str, Any] = {}
         if not repo_url.path:
-            return  # URL does not look right
+            return values  # URL does not look right
         base = repo_url.path[1:].split("/")
         if not len(base) > 1:
-            return  # URL does not look right
+            return values  # URL does not look right
         slug = base.pop()
 
-        self.project_hoster = repo_url.host
-        self.project_org = "/".join(base)
-        self.project_slug = slug
-        self.project_name = slug
-
-        if pages_domain := PAGES_DOMAINS.get(self.project_hoster.host):
-            self.project_pages_domain = pages_domain
+        values.update(
+            project_hoster=repo_url.host,
+            project_org="/".join(base),
+            project_slug=slug,
+            project_name=slug,
+        )
+        if inferred_domain := PAGES_DOMAINS.get(repo_url.host):
+            pages_domain = values["project_pages_domain"] = inferred_domain
 
-        if self.project_pages_domain:
+        if pages_domain:
             # if the service was successfully identified, we can also prefill the project docs URL \_^v^_/
             main_group, subgroups = base[0].lower(), "/".join(base[1:]).lower()
             rest_path = "" if not subgroups else f"/{subgroups}"
-            self.project_pages_url = f"https://{main_group}.{self.project_pages_domain}{rest_path}/{self.project_slug}"
+            values["project_pages_url"] = (
+                f"https://{main_group}.{pages_domain}{rest_path}/{slug}"
+            )
+        return values
+
+    @staticmethod
+    def _inferred_repo_url(hoster: Any, org: str, slug: str) -> str:
+        host = str(hoster).removeprefix("https://").split("/")[0]
+        return f"https://{host}/{org}/{slug}"
+
+    def infer_from_output_dir(self, path: Path):
+        """Infer field values from the passed project directory."""
+        for key, value in self._output_dir_values(path).items():
+            setattr(self, key, value)
+
+    def infer_from_repo_url(self, url: Union[str, HttpUrl]):
+        """Infer field values from passed repository URL."""
+        self.project_repo_url = url
+        values = self._repo_url_values(self.project_repo_url, self.project_pages_domain)
+        for key, value in values.items():
+            setattr(self, key, value)
 
     def infer_repo_url(self):
         """Infer and set repo URL from other fields."""
-        url = (
-            f"https://{self.project_hoster.host}/{self.project_org}/{self.project_slug}"
+        self.project_repo_url = self._inferred_repo_url(
+            self.project_hoster, self.project_org, self.project_slug
         )
-        self.project_repo_url = url
+
+    @classmethod
+    def from_overrides(
+        cls,
+        base: Optional["FPCConfig"] = None,
+        overrides: Optional[Dict[str, Any]] = None,
+        *,
+        repo_url: Optional[str] = None,
+        output_dir: Optional[Path] = None,
+    ) -> Self:
+        """Return a new config based on given config, overrides and inferred values.
+
+        Values inferred from the repository URL (which can also be passed as override)
+        and the output directory can be overridden explicitly. If the repository URL
+        is not known, it is inferred from the other fields.
+
+        Unlike assigning the values one by one, the config is validated only once
+        and the raised ValidationError contains the errors of all invalid fields.
+        """
+        # NOTE: unset values must be left out, None is not valid for most fields
+        values = {k: v for k, v in base or [] if v is not None}
+        overrides = dict(overrides or {})
+        if unknown := [k for k in overrides if k not in cls.model_fields]:
+            raise ValueError(f"Unknown setting: {', '.join(unknown)}")
+
+        if url := overrides.pop("project_repo_url", None) or repo_url:
+            try:
+                parsed_url = _HTTP_URL.validate_python(url)
+            except ValidationError:
+                values["project_repo_url"] = url  # reported in final validation
+            else:
+                pages_domain = values.get("project_pages_domain")
+                values["project_repo_url"] = parsed_url
+                values.update(cls._repo_url_values(parsed_url, pages_domain))
+        if output_dir:
+            values.update(cls._output_dir_values(output_dir))
+        values.update(overrides)
+
+        inferrable = all(
+            values.get(k) for k in ["project_hoster", "project_org", "project_slug"]
+        )
+        if not values.get("project_repo_url") and inferrable:
+            values["project_repo_url"] = cls._inferred_repo_url(
+                values["project_hoster"], values["project_org"], values["project_slug"]
+            )
+        return cls.model_validate(values)
 
 
 class CookiecutterConfig(BaseModel):
@@ -380,6 +459,8 @@ class CookiecutterConfig(BaseModel):
     @classmethod
     def load(cls, *, config_file: Path = None, default_config: bool = False) -> Self:
         """Load config from ~/.cookiecutterrc (if missing, returns defaults)."""
+        from cookiecutter.config import get_user_config
+
         try:
             dct = get_user_config(
                 config_file=config_file, default_config=default_config
@@ -393,6 +474,8 @@ class CookiecutterConfig(BaseModel):
 
     def save(self):
         """Save current config to ~/.cookiecutterrc."""
+        from pydantic_yaml import to_yaml_file
+
         to_yaml_file(self.config_path(), self, exclude_none=True)
 
 
@@ -450,6 +533,8 @@ class CookiecutterJson(BaseModel):
     # additional settings
     init_cli: bool
     init_api: bool
+    init_bench: bool
+    init_profiling: bool
     is_github: bool
 
     @classmethod
@@ -484,6 +569,8 @@ class CookiecutterJson(BaseModel):
                 project_pages_url=str(pconf.project_pages_url),
                 init_cli=pconf.init_cli,
                 init_api=pconf.init_api,
+                init_bench=pconf.init_bench,
+                init_profiling=pconf.init_profiling,
                 is_github=pconf.is_github(),
             )
         )
@@ -0,0 +1,220 @@
+"""Shared cache of the dependencies of generated projects, for fast offline installs.
+
+For each variant of the template (i.e. combination of included example code),
+the resolved `poetry.lock` is cached, so poetry does not need to resolve the
+dependencies again. After warming the cache, a wheelhouse with all locked
+packages is available and the pre-commit hooks are installed, so that new projects
+can be set up without network.
+"""
+
+import shutil
+import sys
+from itertools import product
+from pathlib import Path
+from shutil import which
+from typing import List, Optional
+from uuid import uuid1
+
+from .config import CookiecutterJson
+from .hookcache import missing_hook_envs
+from .licenses import COMMON_LICENSES, LicenseStore
+from .pipeline import Pipeline, StepResult
+from .utils import (
+    TempDir,
+    deactivated_venv_env,
+    render_template,
+    template_defaults,
+    template_hash,
+    user_cache_dir,
+)
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:  # pragma: no cover
+    import tomli as tomllib
+
+
+def variant_name(init_cli: bool, init_api: bool, init_bench: bool) -> str:
+    """Return name of the template variant (determines the set of dependencies)."""
+    return f"cli-{int(init_cli)}_api-{int(init_api)}_bench-{int(init_bench)}"
+
+
+def lock_requirements(poetry_lock: str) -> List[str]:
+    """Return pinned requirements (with environment markers) for all locked packages."""
+    reqs = []
+    for pkg in tomllib.loads(poetry_lock).get("package", []):
+        req = f"{pkg['name']}=={pkg['version']}"
+        markers = pkg.get("markers")
+        if isinstance(markers, dict):  # markers can differ by dependency group
+            markers = " or ".join(f"({m})" for m in sorted(set(markers.values())))
+        reqs.append(f"{req} ; {markers}" if markers else req)
+    return reqs
+
+
+class DependencyCache:
+    """Cached lock files (per template state and variant) and a shared wheelhouse.
+
+    The whole directory can be copied to machines without network access.
+    """
+
+    path: Path
+
+    def __init__(self, path: Optional[Path] = None):
+        """Open a dependency cache (by default, located in the user cache directory)."""
+        self.path = path or user_cache_dir() / "deps"
+        self.wheels.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def wheels(self) -> Path:
+        """Directory with wheels of all packages needed by any template variant."""
+        return self.path / "wheels"
+
+    def locks(self) -> Path:
+        """Return directory with lock files for the current template state.
+
+        Lock files of other template states are removed.
+        """
+        locks_root = self.path / "locks"
+        locks_dir = locks_root / template_hash()[:16]
+        if not locks_dir.is_dir() and locks_root.is_dir():
+            for stale in locks_root.iterdir():
+                # NOTE: other processes (e.g. batch workers) could have just created it
+                if stale.name != locks_dir.name:
+                    shutil.rmtree(stale, ignore_errors=True)
+        locks_dir.mkdir(parents=True, exist_ok=True)
+        return locks_dir
+
+    def lock_file(self, variant: str) -> Path:
+        """Return location of the cached poetry.lock of a variant."""
+        return self.locks() / f"{variant}.lock"
+
+    def requirements_file(self, variant: str) -> Path:
+        """Return location of the pinned requirements of a variant.
+
+        It exists only if the wheelhouse contains all of them.
+        """
+        return self.locks() / f"{variant}.txt"
+
+    def is_offline_ready(self, variant: str) -> bool:
+        """Return whether a project of this variant can be installed without network."""
+        return self.requirements_file(variant).is_file()
+
+    def restore_lock(self, proj_root: Path, variant: str) -> bool:
+        """Copy the cached lock file into the project, returns whether it was cached."""
+        lock_file = self.lock_file(variant)
+        if not lock_file.is_file():
+            return False
+        shutil.copyfile(lock_file, proj_root / "poetry.lock")
+        return True
+
+    def store_lock(self, proj_root: Path, variant: str):
+        """Cache the lock file of the project (if none is cached for the variant)."""
+        lock_file = self.lock_file(variant)
+        if not lock_file.is_file():
+            tmp = lock_file.with_name(f".{lock_file.name}.{uuid1()}")
+            shutil.copyfile(proj_root / "poetry.lock", tmp)
+            tmp.replace(lock_file)
+
+    def pending_requirements(self, variant: str) -> Path:
+        """Write pinned requirements of a variant to a temporary file, returns its path.
+
+        Once all wheels are in the wheelhouse, use `mark_offline_ready` to activate it.
+        """
+        reqs = lock_requirements(self.lock_file(variant).read_text(encoding="utf-8"))
+        reqs_file = self.locks() / f"{variant}.pending.txt"
+        reqs_file.write_text("\n".join(reqs) + "\n", encoding="utf-8")
+        return reqs_file
+
+    def mark_offline_ready(self, variant: str):
+        """Activate the pending requirements of a variant (see `pending_requirements`)."""
+        pending = self.locks() / f"{variant}.pending.txt"
+        pending.replace(self.requirements_file(variant))
+
+
+def _variant_project(
+    cc_json: CookiecutterJson,
+    init_cli: bool,
+    init_api: bool,
+    init_bench: bool,
+    output_dir: Path,
+) -> Path:
+    """Render a project of given template variant, returns project directory."""
+    variant = variant_name(init_cli, init_api, init_bench)
+    proj_json = cc_json.model_copy(
+        update=dict(
+            project_slug=variant,
+            project_package=variant.replace("-", "_"),
+            init_cli=init_cli,
+            init_api=init_api,
+            init_bench=init_bench,
+        )
+    )
+    return render_template(proj_json, output_dir)
+
+
+def warm_cache(cache: Optional[DependencyCache] = None) -> List[StepResult]:
+    """Prepare everything needed to set up new projects without network access.
+
+    This locks the dependencies of all template variants, adds them to the wheelhouse,
+    installs the pre-commit hook environments and downloads the texts of common
+    licenses. The wheels are built for the Python interpreter and platform used for
+    projects on this machine.
+
+    Raises PipelineError if it did not succeed for some variant.
+    """
+    cache = cache or DependencyCache()
+    cc_json = CookiecutterJson.model_validate(template_defaults())
+
+    with TempDir() as tmp_root:
+        # NOTE: venvs needed here should not end up in the global poetry venv directory
+        env = dict(deactivated_venv_env(), POETRY_VIRTUALENVS_IN_PROJECT="true")
+        pipeline = Pipeline(tmp_root, env=env)
+        pip_wheel = "python -m pip wheel --no-deps -w".split() + [str(cache.wheels)]
+        prev_wheels = []
+        for flags in product([False, True], repeat=3):
+            variant = variant_name(*flags)
+            if cache.is_offline_ready(variant):
+                continue
+            proj_root = _variant_project(cc_json, *flags, tmp_root)
+
+            def wheels(variant=variant, proj_root=proj_root):
+                cache.store_lock(proj_root, variant)
+                reqs = cache.pending_requirements(variant)
+                pipeline.run_cmd(pip_wheel + ["-r", str(reqs)])
+                cache.mark_offline_ready(variant)
+
+            # resolution of the variants can run concurrently
+            if cache.restore_lock(proj_root, variant):
+                needs = []
+            else:
+                pipeline.add(f"{variant}:lock", cmds=["poetry lock"], cwd=proj_root)
+                needs = [f"{variant}:lock"]
+            # NOTE: concurrent pip runs writing into the wheelhouse are not safe
+            pipeline.add(f"{variant}:wheels", wheels, needs=needs + prev_wheels)
+            prev_wheels = [f"{variant}:wheels"]
+
+        if missing_hook_envs():
+            # hooks are the same for all variants, pre-commit needs a git repository
+            hooks_root = _variant_project(cc_json, True, True, True, tmp_root / "hooks")
+            pipeline.add("hooks:git_init", cmds=["git init"], cwd=hooks_root)
+            if which("pre-commit", path=env.get("PATH")):
+                install = ["pre-commit install-hooks"]
+            else:  # use pre-commit version of the template
+                install = [
+                    "poetry install --only dev --no-root",
+                    "poetry run pre-commit install-hooks",
+                ]
+            pipeline.add(
+                "hook_envs", cmds=install, cwd=hooks_root, needs=["hooks:git_init"]
+            )
+
+        store = LicenseStore()
+        if missing := [i for i in COMMON_LICENSES if not store.is_available(i)]:
+
+            def licenses():
+                for spdx_id in missing:
+                    store.get(spdx_id)
+
+            pipeline.add("licenses", licenses)
+
+        return pipeline.run()
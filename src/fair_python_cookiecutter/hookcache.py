@@ -0,0 +1,80 @@
+"""Detection of pre-commit hook environments needed by generated projects.
+
+pre-commit keeps the environments of all hook repositories in a shared cache,
+keyed by repository and revision. If all hooks pinned in the template are already
+installed there, generated projects can use them without any setup.
+"""
+
+import os
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict
+from pydantic_yaml import parse_yaml_file_as
+
+from .utils import TEMPLATE_DIR
+
+PRE_COMMIT_CONFIG = "{{ cookiecutter.project_slug }}/.pre-commit-config.yaml"
+"""Location of the pre-commit configuration inside of the template."""
+
+
+class HookRepo(BaseModel):
+    """Hook repository entry of a pre-commit configuration."""
+
+    model_config = ConfigDict(extra="ignore")
+
+    repo: str
+    rev: Optional[str] = None
+
+
+class PreCommitConfig(BaseModel):
+    """Part of a pre-commit configuration relevant for the hook environments."""
+
+    model_config = ConfigDict(extra="ignore")
+
+    repos: List[HookRepo] = []
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None):
+        """Load the configuration (by default, the one from the template)."""
+        return parse_yaml_file_as(cls, path or TEMPLATE_DIR / PRE_COMMIT_CONFIG)
+
+    def pinned_repos(self) -> List[HookRepo]:
+        """Return repositories that need an environment ('local' and 'meta' do not)."""
+        return [r for r in self.repos if r.repo not in {"local", "meta"}]
+
+
+def pre_commit_home() -> Path:
+    """Return the cache directory used by pre-commit (same logic as pre-commit)."""
+    if home := os.environ.get("PRE_COMMIT_HOME"):
+        return Path(home)
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "pre-commit"
+
+
+def _is_installed(repo_path: Path) -> bool:
+    # pre-commit marks hook environments that were installed successfully
+    return any(repo_path.glob("*/.install_state_v*"))
+
+
+def missing_hook_envs(
+    config: Optional[PreCommitConfig] = None, home: Optional[Path] = None
+) -> List[str]:
+    """Return repositories (as repo@rev) without an installed environment in the cache."""
+    config = config or PreCommitConfig.load()
+    pinned = [f"{r.repo}@{r.rev}" for r in config.pinned_repos()]
+    db_file = (home or pre_commit_home()) / "db.db"
+    if not db_file.is_file():
+        return pinned
+
+    with closing(sqlite3.connect(f"file:{db_file}?mode=ro", uri=True)) as db:
+        try:
+            rows = db.execute("SELECT repo, ref, path FROM repos").fetchall()
+        except sqlite3.Error:
+            return pinned  # unknown or broken database, must be rebuilt by pre-commit
+    installed = {
+        f"{repo}@{ref}" for repo, ref, path in rows if _is_installed(Path(path))
+    }
+    return [r for r in pinned if r not in installed]
@@ -0,0 +1,149 @@
+"""Offline store of SPDX license texts used to populate the LICENSES directory."""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.error import URLError
+from urllib.request import urlopen
+from uuid import uuid1
+
+from importlib_resources import files
+
+from .spdx import SPDX_DATA_URL
+from .utils import user_cache_dir
+
+LICENSE_TEXTS_DIR = files("fair_python_cookiecutter") / "license_texts"
+"""Bundled snapshot of common license texts, used to seed the license store.
+
+Includes the licenses suggested when asking for the project license, and the ones
+used in the template itself. Other licenses are downloaded once (see README).
+"""
+
+COMMON_LICENSES = [
+    "AGPL-3.0-only",
+    "AGPL-3.0-or-later",
+    "Apache-2.0",
+    "BSD-2-Clause",
+    "BSD-3-Clause",
+    "BSL-1.0",
+    "CC0-1.0",
+    "EPL-2.0",
+    "EUPL-1.2",
+    "GPL-2.0-only",
+    "GPL-2.0-or-later",
+    "GPL-3.0-only",
+    "GPL-3.0-or-later",
+    "LGPL-2.1-only",
+    "LGPL-2.1-or-later",
+    "LGPL-3.0-only",
+    "LGPL-3.0-or-later",
+    "MIT",
+    "MPL-2.0",
+    "Unlicense",
+]
+"""Commonly chosen licenses, their texts are downloaded in advance by `warm-cache`."""
+
+_LICENSE_DECL_RE = re.compile(r'^\s*SPDX-License-Identifier\s*=\s*"([^"]*)"', re.M)
+_LICENSE_ID_RE = re.compile(r"[A-Za-z0-9.+-]+")
+
+
+def license_ids(reuse_toml: str) -> List[str]:
+    """Return all SPDX ids (licenses and exceptions) referenced in a REUSE.toml file."""
+    ids = set()
+    for expr in _LICENSE_DECL_RE.findall(reuse_toml):
+        for token in _LICENSE_ID_RE.findall(expr):
+            if token.upper() not in {"AND", "OR", "WITH"}:
+                ids.add(token)
+    # custom licenses can only be provided by the user
+    return sorted(i for i in ids if not i.startswith("LicenseRef-"))
+
+
+def fetch_license_text(spdx_id: str) -> str:
+    """Download the text of a license from the SPDX license list data."""
+    url = f"{SPDX_DATA_URL}/text/{spdx_id}.txt"
+    try:
+        with urlopen(url, timeout=30) as res:  # noqa: S310
+            return res.read().decode("utf-8")
+    except (URLError, OSError) as e:
+        raise RuntimeError(
+            f"License text for '{spdx_id}' is not available offline and could not be downloaded from {url}: {e}"
+        ) from e
+
+
+def _write_atomic(path: Path, data: bytes):
+    """Write a file so that concurrent readers never see a partial state."""
+    tmp = path.with_name(f".{path.name}.{uuid1()}")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+class LicenseStore:
+    """Content-addressed local store of license texts, keyed by SPDX id.
+
+    Each text is stored in a file named by its SHA-256 hash, an index maps the
+    SPDX ids to the hashes. Missing texts are taken from the bundled snapshot or,
+    as a last resort, downloaded (once).
+    """
+
+    path: Path
+
+    def __init__(self, path: Optional[Path] = None):
+        """Open a license store (by default, located in the user cache directory)."""
+        self.path = path or user_cache_dir() / "licenses"
+        (self.path / "objects").mkdir(parents=True, exist_ok=True)
+
+    def _index(self) -> Dict[str, str]:
+        index_file = self.path / "index.json"
+        if not index_file.is_file():
+            return {}
+        try:
+            return json.loads(index_file.read_text(encoding="utf-8"))
+        except ValueError:
+            return {}  # broken index, texts will be re-added on demand
+
+    def _lookup(self, spdx_id: str) -> Optional[str]:
+        """Return stored text of a license, if it is present and intact."""
+        digest = self._index().get(spdx_id)
+        obj = self.path / "objects" / str(digest)
+        if not digest or not obj.is_file():
+            return None
+        data = obj.read_bytes()
+        if hashlib.sha256(data).hexdigest() != digest:
+            return None
+        return data.decode("utf-8")
+
+    def add(self, spdx_id: str, text: str):
+        """Add a license text to the store."""
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        obj = self.path / "objects" / digest
+        if not obj.is_file():
+            _write_atomic(obj, data)
+
+        index = self._index()  # re-read to keep additions by concurrent users
+        index[spdx_id] = digest
+        _write_atomic(self.path / "index.json", json.dumps(index, indent=2).encode())
+
+    def is_available(self, spdx_id: str) -> bool:
+        """Return whether the text of a license can be provided without download."""
+        bundled = LICENSE_TEXTS_DIR / f"{spdx_id}.txt"
+        return bundled.is_file() or self._lookup(spdx_id) is not None
+
+    def get(self, spdx_id: str, *, download: bool = True) -> str:
+        """Return the text of a license, adding it to the store if necessary."""
+        if (text := self._lookup(spdx_id)) is not None:
+            return text
+
+        bundled = LICENSE_TEXTS_DIR / f"{spdx_id}.txt"
+        if bundled.is_file():
+            text = bundled.read_bytes().decode("utf-8")
+        elif download:
+            text = fetch_license_text(spdx_id)
+        else:
+            raise KeyError(f"License text for '{spdx_id}' is not available offline!")
+
+        self.add(spdx_id, text)
+        return text
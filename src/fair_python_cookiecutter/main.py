@@ -1,14 +1,25 @@
 """Main functions for controlling the template creation."""
 
 import os
+from functools import partial
 from pathlib import Path
 from shutil import which
-from typing import Any, Dict
-
-from cookiecutter.main import cookiecutter
+from typing import Any, Dict, List, Optional, Tuple
 
+from . import __version__, profiling
 from .config import CookiecutterConfig, CookiecutterJson
-from .utils import TempDir, copy_template, run_cmd
+from .depcache import DependencyCache, variant_name
+from .hookcache import missing_hook_envs
+from .licenses import LicenseStore, license_ids
+from .pipeline import Pipeline
+from .render import RenderedFile, RenderedProject, render_project
+from .state import STATE_FILE, ProjectState, ProjectUpdate, file_hash
+from .utils import (
+    deactivated_venv_env,
+    render_template,
+    template_defaults,
+    template_hash,
+)
 
 
 def check_prerequisites():
@@ -41,43 +52,72 @@ def create_gl_issue_template_from_gh(proj_root: Path):
             f.write(strip_yaml_header(open(file).read()))
 
 
+def gl_issue_templates(files: RenderedProject) -> RenderedProject:
+    """Return GitLab issue templates for rendered GitHub ones (like the function above)."""
+    gh_templates = ".github/ISSUE_TEMPLATE/"
+    gl_templates = ".gitlab/issue_templates/"
+    ret = {}
+    for path, file in files.items():
+        name = path[len(gh_templates) :]
+        if not path.startswith(gh_templates) or "/" in name:
+            continue
+        text = strip_yaml_header(file.content.decode("utf-8"))
+        content = text.replace("\n", os.linesep).encode("utf-8")
+        ret[gl_templates + name] = RenderedFile(content, file.mode)
+    return ret
+
+
+def unneeded_code(cc_json: CookiecutterJson) -> List[str]:
+    """Return paths of code examples the user did not wish to have in the project."""
+    pkg = cc_json.project_package
+    to_remove = []
+    if not cc_json.init_cli:
+        to_remove += [f"src/{pkg}/cli.py", "tests/test_cli.py"]
+    if not cc_json.init_api:
+        to_remove += [f"src/{pkg}/api.py", "tests/test_api.py"]
+        to_remove += [f"src/{pkg}/metrics.py", "tests/test_metrics.py"]
+    if not cc_json.init_bench:
+        to_remove += ["benchmarks/__init__.py", "benchmarks/conftest.py"]
+        to_remove += ["benchmarks/test_lib.py"]
+    if not (cc_json.init_bench and cc_json.init_cli):
+        to_remove += ["benchmarks/test_cli.py"]
+    if not (cc_json.init_bench and cc_json.init_api):
+        to_remove += ["benchmarks/test_api.py"]
+    if not cc_json.init_profiling:
+        to_remove += ["scripts/profiling.py", "docs/profiling.md"]
+    return to_remove
+
+
 def remove_unneeded_code(proj_root: Path, conf: CookiecutterConfig):
     """Remove code examples the user did not wish to have in the project."""
-    pkg = conf.fair_python_cookiecutter.project_package()
-    to_remove = []
-    if not conf.fair_python_cookiecutter.init_cli:
-        to_remove += [
-            (proj_root / "src" / pkg / "cli.py"),
-            (proj_root / "tests" / "test_cli.py"),
-        ]
-    if not conf.fair_python_cookiecutter.init_api:
-        to_remove += [
-            (proj_root / "src" / pkg / "api.py"),
-            (proj_root / "tests" / "test_api.py"),
-        ]
-    for file in to_remove:
-        if file.is_file():
+    for path in unneeded_code(CookiecutterJson.from_config(conf)):
+        if (file := proj_root / path).is_file():
             file.unlink()
+            if not any(file.parent.iterdir()):
+                file.parent.rmdir()
 
 
 def download_licenses(
     proj_root: Path, conf: CookiecutterConfig, *, force_download: bool = False
 ):
-    """Download all needed licenses and create main LICENSE file."""
-    # download licenses if no licenses dir is in the project dir
+    """Add all needed licenses and create main LICENSE file.
+
+    The license texts are taken from the local license store,
+    so usually no network access is needed.
+    """
+    # populate licenses if no licenses dir is in the project dir
     if force_download or not (proj_root / "LICENSES").is_dir():
         # first rename temp-REUSE.toml to REUSE.toml
         if (proj_root / "temp-REUSE.toml").is_file():
             (proj_root / "temp-REUSE.toml").rename(proj_root / "REUSE.toml")
-        # only install reuse/pipx if it is not found
-        reuse_cmd = "reuse --suppress-deprecation download --all"
-        if not which("reuse"):
-            reuse_cmd = "pipx run " + reuse_cmd
-            if not which("pipx"):
-                run_cmd("poetry run pip install pipx", cwd=proj_root)
-                reuse_cmd = "poetry run " + reuse_cmd
-        # download licenses
-        run_cmd(reuse_cmd, cwd=proj_root)
+        # add texts of all licenses referenced in REUSE.toml
+        store = LicenseStore()
+        licenses_dir = proj_root / "LICENSES"
+        licenses_dir.mkdir(exist_ok=True)
+        reuse_toml = (proj_root / "REUSE.toml").read_text(encoding="utf-8")
+        for spdx_id in license_ids(reuse_toml):
+            text = store.get(spdx_id)
+            (licenses_dir / f"{spdx_id}.txt").write_bytes(text.encode("utf-8"))
 
     # copy main license over from resulting licenses directory
     license_name = conf.fair_python_cookiecutter.project_license
@@ -85,23 +125,177 @@ def download_licenses(
     license.write_text((proj_root / "LICENSES" / f"{license_name}.txt").read_text())
 
 
-def init_git_repo(tmp_root: Path, proj_root: Path):
-    # NOTE: script is OS-agnostic, .bat extension is for windows, bash does not care
-    post_gen_script = tmp_root / "post_gen_project.bat"
-    # rewrite newlines correctly for the OS
-    post_gen_script.write_text(post_gen_script.read_text(), encoding="utf-8")
-    if os.name != "nt":
-        run_cmd(f"bash {post_gen_script}", cwd=proj_root)
-    else:
-        run_cmd(f"{post_gen_script}", cwd=proj_root)
+COMMIT_MSG = [
+    "generated project using fair-python-cookiecutter",
+    "https://github.com/Materials-Data-Science-and-Informatics/fair-python-cookiecutter",
+]
+
+
+def post_gen_pipeline(
+    proj_root: Path, conf: CookiecutterConfig, *, name: Optional[str] = None
+) -> Pipeline:
+    """Return pipeline that initializes the dev environment and git repository.
 
+    Steps that do not depend on each other (e.g. installing the project dependencies,
+    setting up pre-commit hook environments and adding license texts) run concurrently.
+    """
+    pconf = conf.fair_python_cookiecutter
+    deps = DependencyCache()
+    variant = variant_name(pconf.init_cli, pconf.init_api, pconf.init_bench)
 
-def finalize_repository(tmp_root: Path, proj_root: Path, conf: CookiecutterConfig):
-    """Finalize instantiated repository based on configuration."""
-    create_gl_issue_template_from_gh(proj_root)
-    remove_unneeded_code(proj_root, conf)
-    download_licenses(proj_root, conf)
-    init_git_repo(tmp_root, proj_root)
+    pipeline = Pipeline(proj_root, env=deactivated_venv_env(), name=name)
+    pipeline.add("git_init", cmds=["git init"])
+    pipeline.add("licenses", partial(download_licenses, proj_root, conf))
+    # a cached lock file spares poetry the dependency resolution
+    pipeline.add("restore_lock", partial(deps.restore_lock, proj_root, variant))
+    install = ["poetry install --with docs"]
+    if deps.is_offline_ready(variant):
+        # install locked packages from the wheelhouse, so poetry has nothing to download
+        reqs = deps.requirements_file(variant)
+        pip_install = "poetry run python -m pip install --no-index --no-deps"
+        install.insert(
+            0, pip_install.split() + ["-f", str(deps.wheels), "-r", str(reqs)]
+        )
+    # NOTE: docs dependencies are installed by the same poetry run (which installs
+    # packages in parallel), concurrent installs into one venv are not safe
+    pipeline.add("poetry_install", cmds=install, needs=["restore_lock"])
+    pipeline.add(
+        "store_lock",
+        partial(deps.store_lock, proj_root, variant),
+        needs=["poetry_install"],
+        may_fail=True,  # only an optimization for the next time
+    )
+    pipeline.add(
+        "git_hooks",
+        cmds=["poetry run poe init-dev"],
+        needs=["git_init", "poetry_install"],
+    )
+    # hook environments are shared by all projects (see warm-cache command)
+    hook_envs = []
+    if missing_hook_envs():
+        hook_envs = ["hook_envs"]
+        # they do not depend on the project venv, if pre-commit is available
+        if which("pre-commit", path=pipeline.env.get("PATH")):
+            pipeline.add(
+                "hook_envs", cmds=["pre-commit install-hooks"], needs=["git_init"]
+            )
+        else:
+            pipeline.add(
+                "hook_envs",
+                cmds=["poetry run pre-commit install-hooks"],
+                needs=["git_init", "poetry_install"],
+            )
+
+    # NOTE: pre-commit signals modified files with a non-zero exit code
+    pipeline.add(
+        "stage", cmds=["git add ."], needs=["git_init", "licenses", "poetry_install"]
+    )
+    pipeline.add(
+        "somesy",
+        cmds=["poetry run pre-commit run somesy"],
+        needs=["stage", *hook_envs],
+        may_fail=True,
+    )
+    pipeline.add("stage_somesy", cmds=["git add ."], needs=["somesy"])
+    pipeline.add(
+        "all_hooks",
+        cmds=["poetry run pre-commit run --all"],
+        needs=["stage_somesy"],
+        may_fail=True,
+    )
+    # NOTE: the hooks modify generated files, which must not look like user changes
+    pipeline.add(
+        "record_committed", partial(record_committed, proj_root), needs=["all_hooks"]
+    )
+    pipeline.add("stage_all", cmds=["git add ."], needs=["record_committed"])
+    commit = "poetry run git commit".split() + [
+        "-m",
+        COMMIT_MSG[0],
+        "-m",
+        COMMIT_MSG[1],
+    ]
+    pipeline.add("commit", cmds=[commit], needs=["stage_all", "git_hooks"])
+    pipeline.add("main_branch", cmds=["git branch -M main"], needs=["commit"])
+    return pipeline
+
+
+RENAMED_FILES = {"temp-REUSE.toml": "REUSE.toml"}
+"""Rendered files that are moved to their final location during finalization."""
+
+
+def generated_files(cc_json: CookiecutterJson) -> RenderedProject:
+    """Return files generated from the template (before the post-generation pipeline)."""
+    _, files = render_project(cc_json)
+    for path in unneeded_code(cc_json):
+        files.pop(path, None)
+    for src, trg in RENAMED_FILES.items():
+        if src in files:
+            files[trg] = files.pop(src)
+    files.update(gl_issue_templates(files))
+    return files
+
+
+def preview_repository(
+    conf: CookiecutterConfig, output_dir: Path
+) -> Tuple[Path, RenderedProject]:
+    """Return directory and files of the repository that would be created.
+
+    Nothing is written and no external tools are used, the files are rendered in memory.
+    """
+    cc_json = CookiecutterJson.from_config(conf)
+    return output_dir / cc_json.project_slug, generated_files(cc_json)
+
+
+def record_state(proj_root: Path, cc_json: CookiecutterJson):
+    """Store template inputs and hashes of generated files in the project.
+
+    Must be called before the post-generation steps, when the files in the project
+    are still exactly the generated ones (i.e. what `generated_files` returns).
+    """
+    files = {}
+    for file in sorted(proj_root.rglob("*")):
+        path = file.relative_to(proj_root).as_posix()
+        if file.is_file() and path != STATE_FILE and not path.startswith(".git/"):
+            files[RENAMED_FILES.get(path, path)] = file_hash(file.read_bytes())
+    ProjectState(
+        fpc_version=__version__,
+        template_hash=template_hash(),
+        cookiecutter=cc_json.model_dump(by_alias=True),
+        files=dict(sorted(files.items())),
+    ).save(proj_root)
+
+
+def record_committed(proj_root: Path):
+    """Add hashes of generated files that were changed by post-generation steps."""
+    state = ProjectState.load(proj_root)
+    state.committed = {}
+    for path, generated in state.files.items():
+        if (file := proj_root / path).is_file():
+            if (digest := file_hash(file.read_bytes())) != generated:
+                state.committed[path] = digest
+    state.save(proj_root)
+
+
+def finalize_repository(
+    proj_root: Path, conf: CookiecutterConfig, *, name: Optional[str] = None
+):
+    """Finalize instantiated repository based on configuration.
+
+    If a name is given, it prefixes the progress messages (e.g. in batch mode).
+    Raises PipelineError if a required post-generation step failed.
+    """
+    with profiling.phase("create_gl_issue_template_from_gh"):
+        create_gl_issue_template_from_gh(proj_root)
+    with profiling.phase("remove_unneeded_code"):
+        remove_unneeded_code(proj_root, conf)
+    with profiling.phase("record_state"):
+        record_state(proj_root, CookiecutterJson.from_config(conf))
+    with profiling.phase("post_gen_pipeline"):
+        post_gen_pipeline(proj_root, conf, name=name).run()
+    if name:
+        print(f"[{name}] All done! The project repository is ready.")
+    else:
+        print("-------->  All done! Your project repository is ready :)  <--------")
 
 
 def create_repository(
@@ -111,22 +305,112 @@ def create_repository(
     cc_args: Dict[str, Any] = None,
     keep_on_fail: bool = False,
 ) -> Path:
-    """Create a new repository based on given configuration, returns resulting directory."""
+    """Create a new repository based on given configuration, returns resulting directory.
+
+    Additional cookiecutter arguments are passed to `cookiecutter.generate.generate_files`.
+    """
     cc_json = CookiecutterJson.from_config(conf)
     cc_args = cc_args or {}
 
     check_prerequisites()
-    with TempDir(keep=keep_on_fail) as tmp_root:
-        copy_template(tmp_root, cookiecutter_json=cc_json)
-        cookiecutter(
-            template=str(tmp_root),  # copy of template
-            no_input=True,  # if cookiecutter still needs to ask, we did a mistake
-            output_dir=str(output_dir),
+    with profiling.phase("render_template"):
+        repo_dir = render_template(
+            cc_json,
+            output_dir,
             accept_hooks=True,
             keep_project_on_failure=keep_on_fail,
             **cc_args,
         )
-        repo_dir = output_dir / cc_json.project_slug
-        finalize_repository(tmp_root, repo_dir, conf)
+    with profiling.phase("finalize_repository"):
+        finalize_repository(repo_dir, conf)
+
+    return repo_dir
+
+
+def update_repository(proj_root: Path, *, dry_run: bool = False) -> ProjectUpdate:
+    """Update a generated project to the current state of the template.
+
+    The template is rendered in memory with the original inputs. Based on the hashes
+    recorded in the project, only files where the template output changed are written,
+    and only if they were not modified in the project (otherwise they are reported as
+    conflicts). Post-generation steps are only repeated if their inputs changed.
+    Template variables that were added after the project was generated get their
+    default values.
+    """
+    state = ProjectState.load(proj_root)
+    cc_json = CookiecutterJson.model_validate(
+        {**template_defaults(), **state.cookiecutter}
+    )
+    cc_json = cc_json.model_copy(update=dict(fpc_version=__version__))
+    files = generated_files(cc_json)
+    new_hashes = {path: file_hash(f.content) for path, f in files.items()}
+
+    result = ProjectUpdate()
+    hashes = dict(new_hashes)
+    committed = dict(state.committed)
+    for path in sorted(set(state.files) | set(new_hashes)):
+        base, new = state.files.get(path), new_hashes.get(path)
+        if base == new:
+            continue  # template output did not change
+        target = proj_root / path
+        current = file_hash(target.read_bytes()) if target.is_file() else None
+        if current == new:
+            committed.pop(path, None)
+            continue  # already up to date
+        if current != state.committed_hash(path):
+            result.conflicts.append(path)
+            hashes.pop(path, None)
+            if base:  # keep old state, so the conflict is detected again
+                hashes[path] = base
+            continue
+        committed.pop(path, None)
+        if new is None:
+            result.removed.append(path)
+        else:
+            (result.added if base is None else result.updated).append(path)
+
+    pipeline = update_pipeline(proj_root, cc_json, result.changed())
+    result.steps = list(pipeline.steps)
+    if dry_run:
+        return result
+
+    for path in result.removed:
+        (proj_root / path).unlink()
+    for path in result.added + result.updated:
+        target = proj_root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(files[path].content)
+        target.chmod(files[path].mode)
+    state.fpc_version = __version__
+    state.template_hash = template_hash()
+    state.cookiecutter = cc_json.model_dump(by_alias=True)
+    state.files = dict(sorted(hashes.items()))
+    state.committed = committed
+    state.save(proj_root)
+
+    pipeline.run()
+    return result
+
 
-        return repo_dir
+def update_pipeline(
+    proj_root: Path, cc_json: CookiecutterJson, changed: List[str]
+) -> Pipeline:
+    """Return pipeline with the post-generation steps affected by the changed files."""
+    pipeline = Pipeline(proj_root, env=deactivated_venv_env())
+    if not (proj_root / ".git").exists():
+        pipeline.add("git_init", cmds=["git init"])
+    if "REUSE.toml" in changed:
+        conf = CookiecutterConfig()
+        conf.fair_python_cookiecutter.project_license = cc_json.project_license
+        licenses = partial(download_licenses, proj_root, conf, force_download=True)
+        pipeline.add("licenses", licenses)
+    if "pyproject.toml" in changed:
+        # the lock file must be updated first, as the dependencies might have changed
+        pipeline.add("poetry_lock", cmds=["poetry lock"])
+        install = ["poetry install --with docs"]
+        pipeline.add("poetry_install", cmds=install, needs=["poetry_lock"])
+    if ".pre-commit-config.yaml" in changed and missing_hook_envs():
+        needs = ["poetry_install"] if "poetry_install" in pipeline.steps else []
+        install_hooks = ["poetry run pre-commit install-hooks"]
+        pipeline.add("hook_envs", cmds=install_hooks, needs=needs)
+    return pipeline
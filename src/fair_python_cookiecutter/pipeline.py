@@ -0,0 +1,186 @@
+"""Execution of interdependent steps, running independent ones concurrently."""
+
+import contextvars
+import subprocess
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from shutil import which
+from typing import Callable, Dict, List, Literal, Optional, Sequence, Union
+
+from pydantic import BaseModel
+
+from . import profiling
+
+Command = Union[str, List[str]]
+"""Command line (a string is split on whitespace)."""
+
+StepStatus = Literal["ok", "warning", "failed", "skipped"]
+
+
+class StepResult(BaseModel):
+    """Outcome of a pipeline step."""
+
+    name: str
+    status: StepStatus
+    duration: float = 0
+    """Wall time (in seconds) spent in the step."""
+    error: Optional[str] = None
+    """Description of the problem (with the output of the failed command, if any)."""
+
+
+class PipelineError(RuntimeError):
+    """Raised if at least one required step of a pipeline failed."""
+
+    def __init__(self, results: List[StepResult]):
+        """Create error from the results of all steps."""
+        self.results = results
+        failed = [r for r in results if r.status == "failed"]
+        skipped = [r.name for r in results if r.status == "skipped"]
+        msg = "\n".join(f"Step '{r.name}' failed: {r.error}" for r in failed)
+        if skipped:
+            msg += f"\nSkipped steps: {', '.join(skipped)}"
+        super().__init__(msg)
+
+
+class Step:
+    """A named unit of work with dependencies on other steps."""
+
+    def __init__(
+        self,
+        name: str,
+        action: Callable[[], None],
+        *,
+        needs: Sequence[str] = (),
+        may_fail: bool = False,
+    ):
+        """Create a step (if may_fail is set, a failure does not affect other steps)."""
+        self.name = name
+        self.action = action
+        self.needs = list(needs)
+        self.may_fail = may_fail
+
+
+class Pipeline:
+    """Graph of steps, where each step is started as soon as its dependencies are done.
+
+    Steps depending on a failed step are skipped, all other steps are still completed.
+    """
+
+    def __init__(
+        self,
+        cwd: Path,
+        *,
+        env: Optional[Dict[str, str]] = None,
+        workers: Optional[int] = None,
+        name: Optional[str] = None,
+    ):
+        """Create an empty pipeline (commands are run in given directory and env).
+
+        If a name is given, it prefixes the progress messages (e.g. to tell apart
+        pipelines that run concurrently).
+        """
+        self.cwd = cwd
+        self.env = env
+        self.workers = workers
+        self.name = name
+        self.steps: Dict[str, Step] = {}
+
+    def add(
+        self,
+        name: str,
+        action: Optional[Callable[[], None]] = None,
+        *,
+        cmds: Sequence[Command] = (),
+        cwd: Optional[Path] = None,
+        needs: Sequence[str] = (),
+        may_fail: bool = False,
+    ):
+        """Add a step that runs a Python function or a sequence of commands.
+
+        Commands are run in the directory of the pipeline, unless cwd is given.
+        Dependencies must be added before the steps that need them.
+        """
+        if name in self.steps:
+            raise ValueError(f"Step '{name}' is already defined!")
+        if unknown := [n for n in needs if n not in self.steps]:
+            raise ValueError(f"Step '{name}' needs undefined steps: {unknown}")
+        if bool(action) == bool(cmds):
+            raise ValueError("Either an action or a list of commands is required!")
+
+        if cmds:
+
+            def action():
+                for cmd in cmds:
+                    self.run_cmd(cmd, cwd=cwd)
+
+        self.steps[name] = Step(name, action, needs=needs, may_fail=may_fail)
+
+    def run_cmd(self, cmd: Command, *, cwd: Optional[Path] = None):
+        """Run a command, capturing the output (raises CalledProcessError on failure)."""
+        args = cmd.split() if isinstance(cmd, str) else list(cmd)
+        # resolve executable in the given environment (needed on Windows)
+        path = (self.env or {}).get("PATH")
+        args[0] = which(args[0], path=path) or args[0]
+        subprocess.run(  # noqa: S603
+            args,
+            cwd=cwd or self.cwd,
+            env=self.env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            check=True,
+        )
+
+    def _run_step(self, step: Step) -> StepResult:
+        start = time.perf_counter()
+        status, error = "ok", None
+        with profiling.phase(step.name):
+            try:
+                step.action()
+            except subprocess.CalledProcessError as e:
+                cmd = " ".join(map(str, e.cmd))
+                error = f"'{cmd}' exited with code {e.returncode}"
+                if e.output:
+                    error += f", output:\n{e.output.rstrip()}"
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+        if error is not None:
+            status = "warning" if step.may_fail else "failed"
+        duration = time.perf_counter() - start
+        msg = f"{'Finished' if status == 'ok' else status.upper()}: {step.name}"
+        print(f"[{self.name}] {msg}" if self.name else msg)
+        return StepResult(name=step.name, status=status, duration=duration, error=error)
+
+    def run(self) -> List[StepResult]:
+        """Run all steps, returns their results in order of definition.
+
+        Raises PipelineError if a step failed that was not allowed to fail.
+        """
+        results: Dict[str, StepResult] = {}
+        pending = dict(self.steps)
+        running: Dict[Future, str] = {}
+        with ThreadPoolExecutor(self.workers) as pool:
+            while pending or running:
+                # NOTE: steps are ordered, so skipping propagates in a single pass
+                for name, step in list(pending.items()):
+                    deps = [results.get(n) for n in step.needs]
+                    if any(r and r.status in ("failed", "skipped") for r in deps):
+                        results[name] = StepResult(name=name, status="skipped")
+                    elif all(deps):
+                        # copy context to keep nesting of profiled phases
+                        ctx = contextvars.copy_context()
+                        running[pool.submit(ctx.run, self._run_step, step)] = name
+                    else:
+                        continue
+                    del pending[name]
+
+                if running:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        results[running.pop(future)] = future.result()
+
+        ordered = [results[name] for name in self.steps]
+        if any(r.status == "failed" for r in ordered):
+            raise PipelineError(ordered)
+        return ordered
@@ -0,0 +1,77 @@
+"""Preview of generated projects without writing them (for --dry-run).
+
+The template is rendered in memory only, so that configurations can be checked
+quickly and without side effects before the projects are actually created.
+"""
+
+import difflib
+from pathlib import Path
+from typing import List
+
+from pydantic import BaseModel
+from typing_extensions import Self
+
+from .render import RenderedProject
+from .state import file_hash
+
+
+class ManifestEntry(BaseModel):
+    """Description of one generated file."""
+
+    path: str
+    size: int
+    sha256: str
+    mode: str
+
+
+class ProjectManifest(BaseModel):
+    """Description of all files generated for a project."""
+
+    project_dir: Path
+    files: List[ManifestEntry]
+
+    @classmethod
+    def from_files(cls, project_dir: Path, files: RenderedProject) -> Self:
+        """Create manifest of the rendered files of a project."""
+        entries = [
+            ManifestEntry(
+                path=path,
+                size=len(f.content),
+                sha256=file_hash(f.content),
+                mode=f"{f.mode:04o}",
+            )
+            for path, f in sorted(files.items())
+        ]
+        return cls(project_dir=project_dir, files=entries)
+
+    def total_size(self) -> int:
+        return sum(entry.size for entry in self.files)
+
+
+def _lines(content: bytes) -> List[str]:
+    return content.decode("utf-8").splitlines(keepends=True)
+
+
+def diff_project(files: RenderedProject, directory: Path) -> str:
+    """Return differences of an existing directory to the rendered files (unified diff).
+
+    Files in the directory that are not generated from the template are ignored.
+    """
+    chunks = []
+    for path, f in sorted(files.items()):
+        target = directory / path
+        current = target.read_bytes() if target.is_file() else None
+        if current == f.content:
+            continue
+        old_name = f"a/{path}" if current is not None else "/dev/null"
+        try:
+            old = _lines(current) if current is not None else []
+            new = _lines(f.content)
+        except UnicodeDecodeError:
+            chunks.append(f"Binary files {old_name} and b/{path} differ\n")
+            continue
+        diff = difflib.unified_diff(old, new, old_name, f"b/{path}")
+        for line in diff:
+            # make sure that the diff stays readable if the last line has no newline
+            chunks.append(line if line.endswith("\n") else line + "\n")
+    return "".join(chunks)
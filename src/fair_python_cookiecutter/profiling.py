@@ -0,0 +1,180 @@
+"""Measurement of time spent in the different phases of repository creation."""
+
+import cProfile
+import json
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # not available on Windows
+
+
+def children_cpu_time() -> Optional[float]:
+    """Return CPU time used by terminated child processes (if supported by the OS)."""
+    if resource is None:  # pragma: no cover
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+class PhaseTiming(BaseModel):
+    """Wall and CPU time (in seconds) spent in one phase.
+
+    The CPU times are aggregates: they are measured for the whole process, so they
+    include nested phases, and they are only recorded if no other phase overlapped.
+    """
+
+    name: str
+    depth: int = 0
+    wall: float
+    concurrent: bool = False
+    """Whether other phases (not nested in this one) ran at the same time."""
+    cpu: Optional[float] = None
+    """CPU time spent in this process (all threads), unless concurrent."""
+    children_cpu: Optional[float] = None
+    """CPU time spent in terminated child processes, unless concurrent."""
+
+
+class Profiler:
+    """Records timings of (possibly nested) phases, optionally with cProfile stats."""
+
+    def __init__(self, *, cprofile: bool = False):
+        """Create a profiler (if cprofile is set, in-process calls are profiled too)."""
+        self.phases: List[PhaseTiming] = []
+        # NOTE: phases can run in threads, those must copy the context to inherit it
+        self._parents: ContextVar[Tuple[PhaseTiming, ...]] = ContextVar(
+            "parents", default=()
+        )
+        self._running: List[PhaseTiming] = []
+        self._lock = threading.Lock()
+        self._cprofile = cprofile
+        self._profiles: List[cProfile.Profile] = []
+        self._thread = threading.local()
+
+    def _start_cprofile(self) -> Optional[cProfile.Profile]:
+        """Start profiling the current thread, unless it is profiled already."""
+        if not self._cprofile or getattr(self._thread, "profiled", False):
+            return None
+        prof = cProfile.Profile()
+        try:
+            prof.enable()
+        except ValueError:
+            return None  # since Python 3.12, the active profiler covers all threads
+        self._thread.profiled = True
+        return prof
+
+    def _stop_cprofile(self, prof: cProfile.Profile):
+        prof.disable()
+        self._thread.profiled = False
+        with self._lock:
+            self._profiles.append(prof)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[PhaseTiming]:
+        """Measure the time spent in the wrapped code block."""
+        parents = self._parents.get()
+        timing = PhaseTiming(name=name, depth=len(parents), wall=0)
+        token = self._parents.set(parents + (timing,))
+        with self._lock:
+            self.phases.append(timing)
+            # CPU times are process-wide, so they cannot be split between phases
+            for other in self._running:
+                if not any(other is p for p in parents):
+                    timing.concurrent = other.concurrent = True
+            self._running.append(timing)
+        prof = self._start_cprofile()
+
+        wall, cpu = time.perf_counter(), time.process_time()
+        children_cpu = children_cpu_time()
+        try:
+            yield timing
+        finally:
+            timing.wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            if children_cpu is not None:
+                children_cpu = children_cpu_time() - children_cpu
+            if prof is not None:
+                self._stop_cprofile(prof)
+            with self._lock:
+                self._running = [p for p in self._running if p is not timing]
+                if not timing.concurrent:
+                    timing.cpu, timing.children_cpu = cpu, children_cpu
+            self._parents.reset(token)
+
+    def report(self) -> List[dict]:
+        """Return the recorded timings in JSON-serializable form."""
+        return [p.model_dump() for p in self.phases]
+
+    def save_report(self, path: Path):
+        """Write the recorded timings to a JSON file."""
+        path.write_text(json.dumps(self.report(), indent=2), encoding="utf-8")
+
+    def save_stats(self, path: Path):
+        """Write the collected cProfile stats (can be inspected with pstats)."""
+        if not self._cprofile:
+            raise RuntimeError("Profiler was not created with cprofile=True!")
+        with self._lock:
+            profiles = list(self._profiles)
+        # NOTE: before Python 3.12, each thread has its own profile
+        stats = pstats.Stats(*profiles) if profiles else pstats.Stats()
+        stats.dump_stats(str(path))
+
+    def table(self):
+        """Return a rich table with the recorded timings."""
+        from rich.table import Table
+
+        def fmt(t: Optional[float]) -> str:
+            return "-" if t is None else f"{t:.3f}"
+
+        table = Table(
+            "Phase",
+            "Wall [s]",
+            "Process CPU [s]",
+            "Child CPU [s]",
+            title="Profile",
+            caption="CPU times include nested phases and are omitted (-) for phases "
+            "that ran concurrently with others.",
+        )
+        for p in self.phases:
+            table.add_row(
+                "  " * p.depth + p.name, fmt(p.wall), fmt(p.cpu), fmt(p.children_cpu)
+            )
+        return table
+
+
+_active: Optional[Profiler] = None
+
+
+def active() -> Optional[Profiler]:
+    """Return the active profiler, if any."""
+    return _active
+
+
+@contextmanager
+def activate(profiler: Profiler) -> Iterator[Profiler]:
+    """Make the profiler active for the wrapped code block."""
+    global _active
+    _active = profiler
+    try:
+        yield profiler
+    finally:
+        _active = None
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Measure the wrapped code block as a phase, if a profiler is active."""
+    if _active is None:
+        yield
+    else:
+        with _active.phase(name):
+            yield
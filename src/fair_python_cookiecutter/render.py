@@ -0,0 +1,98 @@
+"""In-memory rendering of the template.
+
+The result is the same as the one produced by `cookiecutter.generate.generate_files`,
+but nothing is written to disk, so it can be compared with existing projects.
+"""
+
+import os
+import stat
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from importlib_resources import as_file
+
+from .config import CookiecutterJson
+from .utils import TEMPLATE_DIR, jinja_cache_dir
+
+
+class RenderedFile(NamedTuple):
+    """Contents and permission bits of a rendered file."""
+
+    content: bytes
+    mode: int
+
+
+RenderedProject = Dict[str, RenderedFile]
+"""Rendered files by (POSIX-style) path relative to the project directory."""
+
+
+def _newline(path: Path) -> str:
+    """Return newline style of a file (like cookiecutter, based on the first line)."""
+    with open(path, encoding="utf-8") as f:
+        f.readline()
+    return f.newlines[0] if isinstance(f.newlines, tuple) else f.newlines
+
+
+def render_project(cookiecutter_json: CookiecutterJson) -> Tuple[str, RenderedProject]:
+    """Render the template in memory, returns project directory name and the files."""
+    from binaryornot.check import is_binary
+    from cookiecutter.find import find_template
+    from cookiecutter.generate import is_copy_only_path
+    from cookiecutter.utils import create_env_with_context
+    from jinja2 import FileSystemBytecodeCache, FileSystemLoader
+
+    context = {"cookiecutter": cookiecutter_json.model_dump(by_alias=True)}
+    bytecode_cache = FileSystemBytecodeCache(str(jinja_cache_dir()))
+    context["cookiecutter"]["_jinja2_env_vars"] = {"bytecode_cache": bytecode_cache}
+    env = create_env_with_context(context)
+
+    def render_str(s: str) -> str:
+        return env.from_string(s).render(**context)
+
+    files: RenderedProject = {}
+    with as_file(TEMPLATE_DIR) as repo_dir:
+        template_dir = Path(find_template(repo_dir, env))
+        env.loader = FileSystemLoader([str(template_dir), str(repo_dir / "templates")])
+
+        def add_file(infile: Path, outfile: str, template_name: Optional[str]):
+            """Add file, rendering it with given template name (if not None)."""
+            if not os.path.basename(outfile):
+                return  # file name is empty, file is skipped
+            mode = stat.S_IMODE(infile.stat().st_mode)
+            if template_name is None or is_binary(str(infile)):
+                content = infile.read_bytes()
+            else:
+                template = env.get_template(template_name.replace(os.path.sep, "/"))
+                text = template.render(**context)
+                newline = context["cookiecutter"].get("_new_lines") or _newline(infile)
+                content = text.replace("\n", newline or os.linesep).encode("utf-8")
+            files[Path(outfile).as_posix()] = RenderedFile(content, mode)
+
+        # NOTE: relative paths must be exactly as in cookiecutter to match patterns
+        for root, dirs, filenames in os.walk(template_dir):
+            rel_root = os.path.relpath(root, template_dir)
+
+            render_dirs = []
+            for d in sorted(dirs):
+                rel_dir = os.path.normpath(os.path.join(rel_root, d))
+                if not is_copy_only_path(rel_dir, context):
+                    render_dirs.append(d)
+                    continue
+                # copy the directory without rendering (only its own path is rendered)
+                out_dir = render_str(rel_dir)
+                for sub_root, _, sub_files in os.walk(Path(root) / d):
+                    for f in sub_files:
+                        infile = Path(sub_root) / f
+                        outfile = os.path.join(
+                            out_dir, infile.relative_to(Path(root) / d)
+                        )
+                        add_file(infile, outfile, None)
+            dirs[:] = render_dirs
+
+            for f in sorted(filenames):
+                rel_file = os.path.normpath(os.path.join(rel_root, f))
+                copy_only = is_copy_only_path(rel_file, context)
+                template_name = None if copy_only else rel_file
+                add_file(Path(root) / f, render_str(rel_file), template_name)
+
+    return render_str(template_dir.name), files
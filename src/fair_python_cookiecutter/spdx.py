@@ -0,0 +1,61 @@
+"""Lookup of SPDX license identifiers, based on a compact bundled index.
+
+The index is a sorted list of license ids (one per line), it is only loaded when a
+license id is actually validated. To update it from the SPDX license list, run
+`python -m fair_python_cookiecutter.spdx`.
+"""
+
+import json
+from difflib import get_close_matches
+from functools import lru_cache
+from typing import Dict, List, Optional
+from urllib.request import urlopen
+
+from importlib_resources import files
+
+SPDX_IDS_FILE = files("fair_python_cookiecutter") / "spdx_ids.txt"
+"""Bundled index of all known SPDX license ids."""
+
+SPDX_DATA_URL = "https://raw.githubusercontent.com/spdx/license-list-data/main"
+"""Source of the SPDX license list data (license ids and texts, as `reuse download`)."""
+
+
+@lru_cache(maxsize=1)
+def license_index() -> Dict[str, str]:
+    """Return all known SPDX license ids, by lowercase id."""
+    ids = SPDX_IDS_FILE.read_text(encoding="utf-8").split()
+    return {i.lower(): i for i in ids}
+
+
+def lookup_license(spdx_id: str) -> Optional[str]:
+    """Return the canonical form of an SPDX license id (or None, if it is unknown)."""
+    return license_index().get(spdx_id.strip().lower())
+
+
+def suggest_licenses(query: str, n: int = 5) -> List[str]:
+    """Return up to n known license ids similar to the query (prefix matches first)."""
+    index = license_index()
+    q = query.strip().lower()
+    if not q:
+        return []
+    keys = [k for k in index if k.startswith(q)]
+    if len(keys) < n:
+        similar = get_close_matches(q, index.keys(), n=n, cutoff=0.6)
+        keys += [k for k in similar if k not in keys]
+    return [index[k] for k in keys[:n]]
+
+
+def build_index(licenses_json: str) -> str:
+    """Return index contents for the license list (in SPDX JSON format)."""
+    ids = {lic["licenseId"] for lic in json.loads(licenses_json)["licenses"]}
+    return "\n".join(sorted(ids, key=str.lower)) + "\n"
+
+
+if __name__ == "__main__":  # pragma: no cover
+    from importlib_resources import as_file
+
+    with urlopen(f"{SPDX_DATA_URL}/json/licenses.json", timeout=30) as res:  # noqa: S310
+        index = build_index(res.read().decode("utf-8"))
+    with as_file(SPDX_IDS_FILE) as path:
+        path.write_text(index, encoding="utf-8")
+    print(f"Updated {path} ({index.count(chr(10))} license ids).")
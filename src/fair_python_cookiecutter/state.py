@@ -0,0 +1,68 @@
+"""State of a generated project, used to update it when the template changes."""
+
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+from typing_extensions import Self
+
+STATE_FILE = ".fair-python-cookiecutter.json"
+"""Name of the file in the project directory that stores the state."""
+
+
+def file_hash(content: bytes) -> str:
+    """Return hash of file contents (as stored in the state)."""
+    return hashlib.sha256(content).hexdigest()
+
+
+class ProjectState(BaseModel):
+    """Template inputs and hashes of all generated files of a project."""
+
+    fpc_version: str
+    """Version of the tool that generated the files."""
+    template_hash: str
+    """Hash of the template the files were generated from."""
+    cookiecutter: Dict[str, Any]
+    """Values of the template variables."""
+    files: Dict[str, str]
+    """Hashes of generated file contents, by path relative to the project directory."""
+    committed: Dict[str, str] = {}
+    """Hashes of generated files as committed, if the post-generation steps changed them.
+
+    Tools like `somesy` and the formatters run as pre-commit hooks modify some files,
+    so only these hashes tell whether a file was modified in the project since then.
+    """
+
+    def committed_hash(self, path: str) -> Optional[str]:
+        """Return hash of a generated file as it was committed."""
+        return self.committed.get(path, self.files.get(path))
+
+    @classmethod
+    def load(cls, proj_root: Path) -> Self:
+        """Load the state stored in a project directory."""
+        state_file = proj_root / STATE_FILE
+        if not state_file.is_file():
+            raise ValueError(f"{proj_root} has no {STATE_FILE}, cannot be updated!")
+        return cls.model_validate_json(state_file.read_text(encoding="utf-8"))
+
+    def save(self, proj_root: Path):
+        """Store the state in a project directory."""
+        state_file = proj_root / STATE_FILE
+        state_file.write_text(self.model_dump_json(indent=2) + "\n", encoding="utf-8")
+
+
+class ProjectUpdate(BaseModel):
+    """Outcome of updating a project."""
+
+    added: List[str] = []
+    updated: List[str] = []
+    removed: List[str] = []
+    conflicts: List[str] = []
+    """Files that were changed both in the template and in the project (not touched)."""
+    steps: List[str] = []
+    """Follow-up steps that were run because of the changed files."""
+
+    def changed(self) -> List[str]:
+        """Return all files that were written or removed."""
+        return sorted(self.added + self.updated + self.removed)
@@ -0,0 +1 @@
+"""Benchmarks for {{ cookiecutter.project_slug }}."""
@@ -0,0 +1,12 @@
+"""Configuration of the benchmarks (see the `bench` tasks in `pyproject.toml`)."""
+
+from pathlib import Path
+
+
+def pytest_configure(config):
+    # NOTE: if there is no baseline yet, this run is stored as the baseline
+    storage = Path(config.getoption("benchmark_storage").removeprefix("file://"))
+    if config.option.benchmark_compare and not any(storage.glob("*/*.json")):
+        config.option.benchmark_compare = []
+        config.option.benchmark_compare_fail = None
+        config.option.benchmark_save = "baseline"
@@ -0,0 +1,59 @@
+"""Benchmarks for the API."""
+
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from {{ cookiecutter.project_package }}.api import app, result_cache
+from {{ cookiecutter.project_package }}.metrics import Metrics, MetricsMiddleware
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    result_cache.clear()
+
+
+def test_calc_cached(benchmark):
+    response = benchmark(client.get, "/calculate/add", params={"x": 20, "y": 22})
+    assert response.json() == 42
+
+
+def test_calc_batch(benchmark):
+    items = [{"op": "multiply", "x": i, "y": 3} for i in range(1_000)]
+    body = "".join(json.dumps(item) + "\n" for item in items)
+    response = benchmark(client.post, "/calculate/batch", content=body)
+    assert response.status_code == 200
+
+
+# The middleware overhead is measured on a minimal ASGI app, without HTTP handling.
+
+
+async def plain_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def noop_send(message):
+    pass
+
+
+def serve_requests(asgi_app, n: int = 1_000):
+    async def serve_all():
+        for _ in range(n):
+            scope = {"type": "http", "method": "GET", "path_params": {}}
+            await asgi_app(scope, None, noop_send)
+
+    asyncio.run(serve_all())
+
+
+def test_plain_app(benchmark):
+    benchmark(serve_requests, plain_app)
+
+
+def test_metrics_middleware(benchmark):
+    # compare with test_plain_app to see the overhead of recording the metrics
+    benchmark(serve_requests, MetricsMiddleware(plain_app, Metrics()))
@@ -0,0 +1,18 @@
+"""Benchmarks for the CLI."""
+
+from typer.testing import CliRunner
+
+from {{ cookiecutter.project_package }}.cli import app
+
+runner = CliRunner()
+
+
+def test_calc(benchmark):
+    result = benchmark(runner.invoke, app, ["calc", "add", "20", "22"])
+    assert result.exit_code == 0
+
+
+def test_calc_stream(benchmark):
+    lines = "".join(f"multiply {i} 3\n" for i in range(10_000))
+    result = benchmark(runner.invoke, app, ["calc-stream"], input=lines)
+    assert result.exit_code == 0
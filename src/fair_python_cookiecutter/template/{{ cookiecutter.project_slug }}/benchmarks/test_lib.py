@@ -0,0 +1,19 @@
+"""Benchmarks for the core functionality."""
+
+import numpy as np
+import pytest
+
+from {{ cookiecutter.project_package }}.lib import CalcOperation, calculate, calculate_many
+
+
+@pytest.mark.parametrize("op", list(CalcOperation))
+def test_calculate(benchmark, op: CalcOperation):
+    result = benchmark(calculate, op, 123456789, 7)
+    assert result == calculate(op, 123456789, 7)
+
+
+@pytest.mark.parametrize("n", [1_000, 100_000])
+def test_calculate_many(benchmark, n: int):
+    xs = np.arange(n)
+    result = benchmark(calculate_many, CalcOperation.multiply, xs, 3)
+    assert result[-1] == 3 * (n - 1)
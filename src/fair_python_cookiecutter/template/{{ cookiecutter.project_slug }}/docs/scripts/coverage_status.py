@@ -1,5 +1,10 @@
-"""Mkdocs hook to run tests with coverage collection and generate a badge."""
+"""Mkdocs hook to run tests with coverage collection and generate a badge.
 
+The tests are only run if the code or tests changed since the coverage data was
+collected, so that rebuilds (e.g. with `mkdocs serve`) stay fast.
+"""
+
+import hashlib
 import logging
 from io import StringIO
 from pathlib import Path
@@ -20,12 +25,48 @@ badge_colors = {
 }
 """Colors for overall coverage percentage (0-100)."""
 
+fingerprinted = ["src", "tests", "pyproject.toml"]
+"""Files and directories that determine the test coverage."""
+
+fingerprint_file = Path("htmlcov/.fingerprint")
+"""Fingerprint of the sources the coverage data was collected for."""
+
+
+def fingerprint() -> str:
+    """Return hash of the contents of all files that determine the test coverage."""
+    files = []
+    for name in fingerprinted:
+        path = Path(name)
+        files += [path] if path.is_file() else path.rglob("*")
+    digest = hashlib.sha256()
+    for file in sorted(files):
+        if not file.is_file() or "__pycache__" in file.parts:
+            continue
+        digest.update(file.as_posix().encode("utf-8") + b"\0")
+        digest.update(hashlib.sha256(file.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def collect_coverage(sources: str):
+    """Run the tests in parallel worker processes and create the coverage report."""
+    # NOTE: pytest-cov combines the coverage data of all workers
+    # (timing tests are unreliable in parallel, they are excluded like in test-fast)
+    ret = pytest.main(["--cov", "--cov-report=html", "-n", "auto", "-m", "not timing"])
+    if ret in (pytest.ExitCode.OK, pytest.ExitCode.TESTS_FAILED):
+        fingerprint_file.write_text(sources)
+    else:  # the coverage data is incomplete, try again next time
+        fingerprint_file.unlink(missing_ok=True)
+
 
 def on_pre_build(config):  # noqa
-    """Generate coverage report if it is missing and create a badge."""
-    if not Path("htmlcov").is_dir() or not Path(".coverage").is_file():
-        log.info("Missing htmlcov or .coverage, running pytest to collect.")
-        pytest.main(["--cov", "--cov-report=html"])
+    """Generate coverage report if it is missing or outdated and create a badge."""
+    sources = fingerprint()
+    if not Path(".coverage").is_file() or not fingerprint_file.is_file():
+        log.info("Missing coverage data, running pytest to collect.")
+        collect_coverage(sources)
+    elif fingerprint_file.read_text() != sources:
+        log.info("Code or tests changed, running pytest to collect coverage.")
+        collect_coverage(sources)
     else:
         log.info("Using existing coverage data.")
 
@@ -42,7 +83,7 @@ def on_pre_build(config):  # noqa
         thresholds=badge_colors,
     )
 
+    # NOTE: a rewritten badge would trigger another rebuild with `mkdocs serve`
     badge_svg = Path("docs/coverage_badge.svg")
-    if badge_svg.is_file():
-        badge_svg.unlink()
-    badge.write_badge(badge_svg)
+    if not badge_svg.is_file() or badge_svg.read_text() != badge.badge_svg_text:
+        badge.write_badge(badge_svg, overwrite=True)
@@ -1,17 +1,63 @@
 """Generate the code reference pages.
 
 See: https://mkdocstrings.github.io/recipes/
+
+A manifest with the hashes of the modules is kept between builds, and pages of
+unchanged modules keep the time of their last change. With `--dirty` builds
+(e.g. `mkdocs serve --dirty`), only pages of new or changed modules are rendered.
 """
 
+import hashlib
+import json
+import os
+import time
+from fnmatch import fnmatch
 from pathlib import Path
 
 import mkdocs_gen_files
+from mkdocs.structure.files import File
+
+exclude_patterns = ["*/_[!_]*.py", "*/__main__.py"]
+"""Modules without reference pages (relative to `src`, e.g. private or generated)."""
+
+manifest_file = Path(".cache/gen_ref_pages.json")
+"""Hashes of the modules and times of their last change (in previous builds)."""
+
+
+def file_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def is_built(doc_path: Path, changed: float) -> bool:
+    """Return whether the page in the site is newer than the last change of its module."""
+    page = File(
+        doc_path.as_posix(),
+        src_dir=None,
+        dest_dir=mkdocs_gen_files.config["site_dir"],
+        use_directory_urls=mkdocs_gen_files.config["use_directory_urls"],
+    )
+    dest = Path(page.abs_dest_path)
+    return dest.is_file() and dest.stat().st_mtime >= changed
+
+
+try:
+    manifest = json.loads(manifest_file.read_text(encoding="utf-8"))
+except (OSError, ValueError):
+    manifest = {}
+# NOTE: the rendering of all pages depends on the configuration
+config_hash = file_hash(Path("mkdocs.yml"))
+if manifest.get("config") != config_hash:
+    manifest = {"config": config_hash, "modules": {}}
+modules = {}
 
 nav = mkdocs_gen_files.Nav()
 
 for path in sorted(Path("src").rglob("*.py")):
-    module_path = path.relative_to("src").with_suffix("")
-    doc_path = path.relative_to("src").with_suffix(".md")
+    src_path = path.relative_to("src")
+    if any(fnmatch(src_path.as_posix(), pattern) for pattern in exclude_patterns):
+        continue
+    module_path = src_path.with_suffix("")
+    doc_path = src_path.with_suffix(".md")
     full_doc_path = Path("reference", doc_path)
 
     parts = list(module_path.parts)
@@ -20,8 +66,6 @@ for path in sorted(Path("src").rglob("*.py")):
         parts = parts[:-1]
         doc_path = doc_path.with_name("index.md")
         full_doc_path = full_doc_path.with_name("index.md")
-    elif parts[-1] == "__main__":
-        continue
 
     nav[parts] = doc_path.as_posix()
 
@@ -29,7 +73,20 @@ for path in sorted(Path("src").rglob("*.py")):
         identifier = ".".join(parts)
         print("::: " + identifier, file=fd)
 
-    mkdocs_gen_files.set_edit_path(full_doc_path, path)
+    entry = manifest["modules"].get(src_path.as_posix(), {})
+    if entry.get("hash") == (digest := file_hash(path)):
+        # the page of an unchanged module is not modified (for dirty builds)
+        os.utime(fd.name, (entry["changed"], entry["changed"]))
+    else:
+        entry = {"hash": digest, "changed": time.time()}
+    modules[src_path.as_posix()] = entry
+
+    # NOTE: pages skipped by dirty builds would not use the edit path (and cause a warning)
+    if not is_built(full_doc_path, entry["changed"]):
+        mkdocs_gen_files.set_edit_path(full_doc_path, path)
 
 with mkdocs_gen_files.open("reference/SUMMARY.md", "w") as nav_file:
     nav_file.writelines(nav.build_literate_nav())
+
+manifest_file.parent.mkdir(parents=True, exist_ok=True)
+manifest_file.write_text(json.dumps({"config": config_hash, "modules": modules}))
@@ -0,0 +1,182 @@
+"""Profiling helpers (used by the `profile`, `importtime` and `memprofile` tasks).
+
+Only the Python standard library is used, so they work without network access
+and without any native profiling tools. See the profiling page of the docs.
+"""
+
+import argparse
+import cProfile
+import pstats
+import re
+import subprocess
+import sys
+import tracemalloc
+from importlib import import_module
+from importlib.metadata import entry_points
+from typing import Any, Callable, List, Optional
+
+PACKAGE = "{{ cookiecutter.project_package }}"
+"""Package that is imported by default in the import time report."""
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+"""Line of the `-X importtime` output (self and cumulative time in µs)."""
+
+IMPORTTIME_MARKER = "---- start of import ----"
+
+
+def _console_script(name: str) -> Callable[[], Any]:
+    eps = entry_points()
+    if hasattr(eps, "select"):
+        found = list(eps.select(group="console_scripts", name=name))
+    else:  # Python < 3.10
+        found = [ep for ep in eps.get("console_scripts", []) if ep.name == name]
+    if not found:
+        raise SystemExit(f"No installed console script called '{name}'!")
+    return found[0].load()
+
+
+def load_target(target: str, args: List[str]) -> Callable[[], Any]:
+    """Return function that runs the target with given arguments.
+
+    The target can be `pytest` (then the arguments select the tests), the name of
+    an installed console script (e.g. a CLI entry point of the project) or a
+    reference to a function like `package.module:function`.
+    """
+    if target == "pytest":
+        import pytest
+
+        return lambda: pytest.main(args)
+
+    if ":" in target:
+        module, _, name = target.partition(":")
+        func = getattr(import_module(module), name)
+    else:
+        func = _console_script(target)
+
+    def run():
+        sys.argv = [target, *args]
+        return func()
+
+    return run
+
+
+def run_target(run: Callable[[], Any]) -> Any:
+    """Run the target, returns its exit code (CLI apps usually exit when done)."""
+    try:
+        return run()
+    except SystemExit as e:
+        return e.code
+
+
+def profile(
+    run: Callable[[], Any], *, sort: str, limit: int, output: Optional[str]
+) -> Any:
+    """Run target with cProfile and print the functions that took the most time."""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        code = run_target(run)
+    finally:
+        profiler.disable()
+    if output:
+        profiler.dump_stats(output)
+
+    print(f"\n---- profile (sorted by {sort}) ----", file=sys.stderr)
+    stats = pstats.Stats(profiler, stream=sys.stderr)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return code
+
+
+def importtime(module: str, *, sort: str, limit: int) -> int:
+    """Import the module in a new interpreter and print the slowest imports."""
+    # NOTE: the marker separates the imports done at interpreter startup
+    code = f"import sys; print({IMPORTTIME_MARKER!r}, file=sys.stderr); import {module}"
+    cmd = [sys.executable, "-X", "importtime", "-c", code]
+    proc = subprocess.run(cmd, capture_output=True, text=True)  # noqa: S603
+    output = proc.stderr.split(IMPORTTIME_MARKER + "\n")[-1]
+    rows = []
+    for line in output.splitlines():
+        if m := IMPORTTIME_LINE.match(line):
+            rows.append((int(m[1]), int(m[2]), len(m[3]) // 2, m[4]))
+        elif not line.startswith("import time:"):
+            print(line, file=sys.stderr)  # e.g. an exception during the import
+    if proc.returncode != 0:
+        return proc.returncode
+
+    # top-level imports are the ones directly triggered by the import statement
+    total = sum(cumulative for _, cumulative, depth, _ in rows if depth == 0)
+    rows.sort(key=lambda row: row[1 if sort == "cumulative" else 0], reverse=True)
+    print(f"---- import of {module} took {total / 1000:.1f} ms (sorted by {sort}) ----")
+    print(f"{'self [ms]':>10} {'cumul. [ms]':>12} {'depth':>6}  module")
+    for self_us, cumulative_us, depth, name in rows[:limit]:
+        print(f"{self_us / 1000:10.2f} {cumulative_us / 1000:12.2f} {depth:6}  {name}")
+    return 0
+
+
+def memprofile(run: Callable[[], Any], *, key: str, limit: int, frames: int) -> Any:
+    """Run target with tracemalloc and print the lines that allocated the most memory."""
+    tracemalloc.start(frames)
+    try:
+        code = run_target(run)
+    finally:
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    snapshot = snapshot.filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ]
+    )
+    print(f"\n---- memory (grouped by {key}) ----", file=sys.stderr)
+    print(f"still allocated: {current / 1024:.1f} KiB", file=sys.stderr)
+    print(f"peak: {peak / 1024:.1f} KiB", file=sys.stderr)
+    for stat in snapshot.statistics(key)[:limit]:
+        size = f"{stat.size / 1024:10.1f} KiB {stat.count:8} blocks"
+        print(f"{size}  {stat.traceback[0]}", file=sys.stderr)
+        if key == "traceback":  # also show where the allocating code was called
+            for line in stat.traceback.format(most_recent_first=True)[2:]:
+                print(f"{'':30}{line}", file=sys.stderr)
+    return code
+
+
+def main(argv: Optional[List[str]] = None) -> Any:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    target_help = "pytest, name of a console script or package.module:function"
+    args_help = "arguments for the target (e.g. CLI arguments or pytest selection)"
+
+    p = sub.add_parser("profile", help="profile the time spent in functions")
+    p.add_argument("--sort", default="cumulative", help="pstats sort key")
+    p.add_argument("--limit", type=int, default=30, help="number of rows")
+    p.add_argument("--output", "-o", help="save profile (for `python -m pstats`)")
+    p.add_argument("target", help=target_help)
+    p.add_argument("args", nargs=argparse.REMAINDER, help=args_help)
+
+    p = sub.add_parser("importtime", help="report the time spent for imports")
+    p.add_argument("--sort", choices=["cumulative", "self"], default="cumulative")
+    p.add_argument("--limit", type=int, default=30, help="number of rows")
+    p.add_argument("module", nargs="?", default=PACKAGE, help="module to import")
+
+    p = sub.add_parser("memprofile", help="report lines that allocated memory")
+    p.add_argument("--key", choices=["lineno", "traceback"], default="lineno")
+    p.add_argument("--limit", type=int, default=20, help="number of rows")
+    p.add_argument("--frames", type=int, default=10, help="stack frames to keep")
+    p.add_argument("target", help=target_help)
+    p.add_argument("args", nargs=argparse.REMAINDER, help=args_help)
+
+    opts = parser.parse_args(argv)
+    if opts.command == "importtime":
+        return importtime(opts.module, sort=opts.sort, limit=opts.limit)
+
+    run = load_target(opts.target, opts.args)
+    if opts.command == "profile":
+        return profile(run, sort=opts.sort, limit=opts.limit, output=opts.output)
+    return memprofile(run, key=opts.key, limit=opts.limit, frames=opts.frames)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
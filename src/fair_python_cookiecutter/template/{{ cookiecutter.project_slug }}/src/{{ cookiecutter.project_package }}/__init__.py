@@ -1,7 +1,55 @@
-"""Top level module of the project."""
+"""Top level module of the project.
 
-from importlib.metadata import version
-from typing import Final
+The public submodules are imported only when they are first used (see PEP 562),
+so that importing the package stays fast even if it grows large.
+"""
 
-# Set version, it will use version from pyproject.toml if defined
-__version__: Final[str] = version(__package__ or __name__)
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Final, List
+
+if TYPE_CHECKING:  # pragma: no cover
+    from . import (
+{%- if cookiecutter.init_api %}
+        api,
+{%- endif %}
+{%- if cookiecutter.init_cli %}
+        cli,
+{%- endif %}
+        lib,
+{%- if cookiecutter.init_api %}
+        metrics,
+{%- endif %}
+    )
+
+    __version__: Final[str]
+
+__all__ = [
+    "__version__",
+{%- if cookiecutter.init_api %}
+    "api",
+{%- endif %}
+{%- if cookiecutter.init_cli %}
+    "cli",
+{%- endif %}
+    "lib",
+{%- if cookiecutter.init_api %}
+    "metrics",
+{%- endif %}
+]
+"""Public names (the submodules must be listed here to be imported when used)."""
+
+
+def __getattr__(name: str) -> Any:
+    if name == "__version__":
+        from importlib.metadata import version
+
+        # Set version, it will use version from pyproject.toml if defined
+        globals()["__version__"] = version(__package__ or __name__)
+        return globals()["__version__"]
+    if name in __all__:
+        return import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted({*globals(), *__all__})
@@ -1,24 +1,302 @@
 """API of {{ cookiecutter.project_slug }}."""
-from fastapi import FastAPI, HTTPException
 
-from {{ cookiecutter.project_package }}.lib import CalcOperation, calculate
+import codecs
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from threading import Lock
+from typing import Annotated, Any, Dict, Hashable, List, Optional, Tuple
+
+from fastapi import FastAPI, Header, HTTPException, Request
+from fastapi.responses import (
+    JSONResponse,
+    PlainTextResponse,
+    Response,
+    StreamingResponse,
+)
+from pydantic import BaseModel, ValidationError
+
+from {{ cookiecutter.project_package }} import __version__
+from {{ cookiecutter.project_package }}.lib import CalcOperation, calculate, check_result_size
+from {{ cookiecutter.project_package }}.metrics import CONTENT_TYPE, Metrics, MetricsMiddleware
 
 app = FastAPI()
 
+metrics = Metrics(ops=[op.value for op in CalcOperation])
+"""Metrics of all requests (see `/metrics`)."""
+app.add_middleware(MetricsMiddleware, metrics=metrics)
 
-@app.get("/calculate/{op}")
-def calc(op: CalcOperation, x: int, y: int = 0):
-    """Return result of calculation on two integers."""
+CACHE_SIZE = int(os.environ.get("{{ cookiecutter.project_package | upper }}_CACHE_SIZE", 4096))
+"""Maximum number of results kept in memory (0 disables the cache)."""
+
+CACHE_MAX_AGE = int(os.environ.get("{{ cookiecutter.project_package | upper }}_CACHE_MAX_AGE", 86400))
+"""How long (in seconds) clients and proxies may reuse a result."""
+
+MAX_ITEM_SIZE = 2**16
+"""Maximum size (in characters) of a single item in a batch request."""
+
+
+def _calculate(op: CalcOperation, x: int, y: int) -> int:
+    """Calculate the result, raise ValueError with a helpful message on failure."""
+    check_result_size(op, x, y)  # protects the service from very expensive requests
     try:
         return calculate(op, x, y)
+    except ZeroDivisionError as e:
+        raise ValueError(f"Cannot divide x={x} by y=0!") from e
+
+
+class LRUCache:
+    """Thread-safe cache with a bounded number of entries.
+
+    If it is full, the least recently used entry is evicted.
+    """
+
+    def __init__(self, maxsize: int):
+        """Create an empty cache that can hold at most `maxsize` entries."""
+        self.maxsize = maxsize
+        self.hits = self.misses = self.evictions = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return whether the key is in the cache, and the cached value."""
+        with self._lock:
+            if key not in self._data:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            self._data.move_to_end(key)
+            return True, self._data[key]
+
+    def put(self, key: Hashable, value: Any):
+        """Add an entry to the cache."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Remove all entries (the counters are not reset)."""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return size and usage counters of the cache."""
+        return dict(
+            maxsize=self.maxsize,
+            size=len(self._data),
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+        )
+
+
+result_cache = LRUCache(CACHE_SIZE)
+"""Cache of results of the `calc` endpoint."""
+
+
+def _etag(op: CalcOperation, x: int, y: int) -> str:
+    """Return strong ETag for a calculation (results can only change with the version)."""
+    digest = hashlib.sha256(f"{__version__}:{op.value}:{x}:{y}".encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Return whether an `If-None-Match` header matches the ETag (weak comparison)."""
+    tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+@app.get("/calculate/{op}")
+def calc(
+    op: CalcOperation,
+    x: int,
+    y: int = 0,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+):
+    """Return result of calculation on two integers.
+
+    Results are cached and can be cached by clients (revalidated using the ETag).
+    """
+    headers = {
+        "ETag": _etag(op, x, y),
+        "Cache-Control": f"public, max-age={CACHE_MAX_AGE}",
+    }
+    if if_none_match and _etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    hit, result = result_cache.get((op, x, y))
+    if not hit:
+        try:
+            result = _calculate(op, x, y)
+        except (ValueError, NotImplementedError) as e:
+            raise HTTPException(status_code=422, detail=str(e)) from e
+        result_cache.put((op, x, y), result)
+    headers["X-Cache"] = "HIT" if hit else "MISS"
+    return JSONResponse(result, headers=headers)
+
+
+@app.get("/cache")
+def cache_stats() -> Dict[str, int]:
+    """Return size and hit/miss counters of the result cache."""
+    return result_cache.stats()
+
+
+class CalcRequest(BaseModel):
+    """A single calculation of a batch."""
+
+    op: CalcOperation
+    x: int
+    y: int = 0
+
+
+class JSONItemParser:
+    """Incremental parser for a stream of JSON values (NDJSON or a JSON array).
+
+    Only the current incomplete item is buffered. Invalid items are returned as
+    `ValueError` instances. In NDJSON, parsing continues with the next line,
+    while in a JSON array all remaining input is ignored.
+    """
+
+    def __init__(self):
+        """Create parser for a new stream."""
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._buf = ""
+        self._is_array = None  # unknown until the first character is seen
+        self._need_comma = False
+        self._skip_line = False  # skip the rest of an invalid line
+        self._done = False  # end of the array (or invalid array)
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Add the next chunk of input, returns the items that are complete now."""
+        return self._parse(self._utf8.decode(chunk), final=False)
+
+    def close(self) -> List[Any]:
+        """Finish parsing, returns the remaining items."""
+        items = self._parse(self._utf8.decode(b"", final=True), final=True)
+        if self._is_array and not self._done:
+            items.append(ValueError("Unexpected end of JSON array!"))
+        return items
+
+    def _fail(self, items: List[Any], msg: str):
+        items.append(ValueError(msg))
+        if self._is_array:
+            self._done = True
+            self._buf = ""
+        else:  # just skip the line with the invalid item
+            eol = self._buf.find("\n")
+            self._buf = self._buf[eol + 1 :] if eol >= 0 else ""
+            self._skip_line = eol < 0
+
+    def _parse(self, text: str, *, final: bool) -> List[Any]:
+        if self._skip_line:
+            eol = text.find("\n")
+            self._skip_line = eol < 0
+            text = text[eol + 1 :] if eol >= 0 else ""
+        if self._done:
+            return []
+        self._buf += text
+
+        items: List[Any] = []
+        while buf := self._buf.lstrip():
+            self._buf = buf
+            if self._is_array is None:
+                self._is_array = buf[0] == "["
+                if self._is_array:
+                    self._buf = buf[1:]
+                    continue
+            if self._is_array:
+                if buf[0] == "]":
+                    self._done = True
+                    self._buf = ""
+                    break
+                if self._need_comma:
+                    if buf[0] != ",":
+                        self._fail(items, "Expected ',' between array items!")
+                        break
+                    self._buf = buf[1:]
+                    self._need_comma = False
+                    continue
+
+            try:
+                item, end = self._decoder.raw_decode(buf)
+            except json.JSONDecodeError as e:
+                # in NDJSON, a complete line can be checked without waiting
+                complete = not self._is_array and "\n" in buf
+                if not (final or complete) and len(buf) < MAX_ITEM_SIZE:
+                    break  # wait for more input
+                self._fail(items, f"Invalid JSON: {e.msg}")
+                continue
+            if end == len(buf) and not final:
+                break  # the item might continue in the next chunk
+            items.append(item)
+            self._buf = buf[end:]
+            self._need_comma = bool(self._is_array)
+        return items
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """Streaming response that can be sent while the request body is still read.
+
+    `StreamingResponse` concurrently waits for the client to disconnect, which
+    consumes (and loses) the rest of the request body. Here, only the response
+    content reads the request, which fails if the client disconnects.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def _batch_result(item: Any) -> str:
+    """Return the NDJSON line with the result (or error) of a batch item."""
+    try:
+        if isinstance(item, ValueError):
+            raise item
+        req = CalcRequest.model_validate(item)
+        res = {"result": _calculate(req.op, req.x, req.y)}
+    except ValidationError as e:
+        errs = [f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()]
+        res = {"error": "; ".join(errs)}
+    except (ValueError, NotImplementedError) as e:
+        res = {"error": str(e)}
+    return json.dumps(res) + "\n"
+
+
+@app.post("/calculate/batch")
+async def calc_batch(request: Request) -> DuplexStreamingResponse:
+    """Run many calculations, streaming the results back as NDJSON.
+
+    The request body must contain items like `{"op": "add", "x": 1, "y": 2}`, either
+    one per line (NDJSON) or as a JSON array. It is processed incrementally, and for
+    each item a line with the `result` or an `error` is returned (in the same order).
+    """
+
+    async def results():
+        parser = JSONItemParser()
+        async for chunk in request.stream():
+            if items := parser.feed(chunk):
+                yield "".join(map(_batch_result, items))
+        if items := parser.close():
+            yield "".join(map(_batch_result, items))
+
+    return DuplexStreamingResponse(results(), media_type="application/x-ndjson")
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics_endpoint():
+    """Return request metrics in the Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
 
-    except (ZeroDivisionError, ValueError, NotImplementedError) as e:
-        if isinstance(e, ZeroDivisionError):
-            err = f"Cannot divide x={x} by y=0!"
-        else:
-            err = str(e)
-        raise HTTPException(status_code=422, detail=err) from e
 
 def run():
     import uvicorn
+
     uvicorn.run(app, host="127.0.0.1", port=8000)
@@ -1,8 +1,12 @@
 """CLI of {{ cookiecutter.project_slug }}."""
 
+import os
+from itertools import islice
+from typing import Iterable, Iterator, List, Tuple
+
 import typer
 
-from {{ cookiecutter.project_package }}.lib import CalcOperation, calculate
+from {{ cookiecutter.project_package }}.lib import CalcOperation, calculate, check_result_size
 
 # create subcommand app
 say = typer.Typer()
@@ -21,6 +25,106 @@ def calc(op: CalcOperation, x: int, y: int):
     typer.echo(f"Result: {result}")
 
 
+Line = Tuple[int, str]
+"""Input line with its line number."""
+
+Outcome = Tuple[int, bool, str]
+"""Line number, whether the calculation succeeded, and the result or error."""
+
+
+def _calc_line(line: str) -> int:
+    """Calculate result of a line like `add 20 22`, raise ValueError on failure."""
+    fields = line.split()
+    if len(fields) != 3:
+        raise ValueError(f"Expected 'OP X Y', got {line.strip()!r}")
+    try:
+        op = CalcOperation(fields[0])
+    except ValueError:
+        raise ValueError(f"Unknown operation: {fields[0]}") from None
+    x, y = int(fields[1]), int(fields[2])
+    check_result_size(op, x, y)  # a single line must not block a worker
+    try:
+        return calculate(op, x, y)
+    except ZeroDivisionError:
+        raise ValueError(f"Cannot divide x={x} by y=0!") from None
+
+
+def _calc_chunk(chunk: List[Line]) -> List[Outcome]:
+    """Calculate the results of a chunk of lines (runs in worker processes)."""
+    outcomes: List[Outcome] = []
+    for lineno, line in chunk:
+        try:
+            outcomes.append((lineno, True, str(_calc_line(line))))
+        except (ValueError, NotImplementedError) as e:
+            outcomes.append((lineno, False, str(e)))
+    return outcomes
+
+
+def _chunks(lines: Iterable[str], size: int) -> Iterator[List[Line]]:
+    """Split non-empty lines (without comments) into chunks of given size."""
+    numbered = (
+        (lineno, line)
+        for lineno, line in enumerate(lines, start=1)
+        if line.strip() and not line.lstrip().startswith("#")
+    )
+    while chunk := list(islice(numbered, size)):
+        yield chunk
+
+
+def _calc_chunks(chunks: Iterator[List[Line]], jobs: int) -> Iterator[List[Outcome]]:
+    """Calculate results of all chunks in order, using a pool of `jobs` processes.
+
+    Only a few chunks per process are read ahead, so the memory use is constant.
+    """
+    if jobs <= 1:
+        yield from map(_calc_chunk, chunks)
+        return
+
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(jobs) as pool:
+        pending = deque(pool.submit(_calc_chunk, c) for c in islice(chunks, 2 * jobs))
+        while pending:
+            outcomes = pending.popleft().result()
+            if (chunk := next(chunks, None)) is not None:
+                pending.append(pool.submit(_calc_chunk, chunk))
+            yield outcomes
+
+
+@app.command()
+def calc_stream(
+    source: typer.FileText = typer.Argument(
+        "-", help="File with one calculation per line (default: stdin)."
+    ),
+    jobs: int = typer.Option(
+        1, "--jobs", "-j", min=0, help="Number of processes (0: one per CPU)."
+    ),
+    chunk_size: int = typer.Option(
+        1000, min=1, help="Number of lines that are calculated together."
+    ),
+):
+    """Compute the results of many operations, one per line (e.g. `add 20 22`).
+
+    The results are written line by line while the input is read. Lines that
+    cannot be calculated are skipped and reported with their line number on
+    stderr, and the exit code is 1 if there were any such lines.
+    """
+    chunks = _chunks(source, chunk_size)
+    failed = False
+    for outcomes in _calc_chunks(chunks, jobs or os.cpu_count() or 1):
+        results = []
+        for lineno, ok, text in outcomes:
+            if ok:
+                results.append(text + "\n")
+            else:
+                typer.echo(f"Line {lineno}: {text}", err=True)
+                failed = True
+        typer.echo("".join(results), nl=False)
+    if failed:
+        raise typer.Exit(code=1)
+
+
 # ----
 
 
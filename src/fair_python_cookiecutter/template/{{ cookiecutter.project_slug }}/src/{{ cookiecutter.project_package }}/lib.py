@@ -5,6 +5,10 @@ exposed using some other interface, such as CLI, GUI or an API.
 """
 
 from enum import Enum
+from typing import TYPE_CHECKING, Sequence, Union
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
 
 
 class CalcOperation(str, Enum):
@@ -30,6 +34,92 @@ def calculate(op: CalcOperation, x: int, y: int):
         return x - y
     elif op == CalcOperation.divide:
         return x // y
+    elif op == CalcOperation.power:
+        if y < 0:
+            raise ValueError(f"Cannot raise x={x} to negative power y={y}!")
+        return x**y
 
     err = f"Operation {op} is not implemented!"
     raise NotImplementedError(err)
+
+
+MAX_RESULT_BITS = 2**16
+"""Limit for results of `power` in the API and CLI (huge results take very long)."""
+
+
+def check_result_size(
+    op: CalcOperation, x: int, y: int, max_bits: int = MAX_RESULT_BITS
+):
+    """Raise ValueError if the result of `calculate` would have more than max_bits bits.
+
+    Only `power` turns small inputs into huge results, so only its result is checked.
+    """
+    too_large = abs(x) > 1 and x.bit_length() * y > max_bits
+    if op == CalcOperation.power and too_large:
+        raise ValueError(f"Result of x={x} to the power y={y} would be too large!")
+
+
+# NumPy functions that work like the corresponding cases in `calculate`
+_UFUNC_NAMES = {
+    CalcOperation.add: "add",
+    CalcOperation.multiply: "multiply",
+    CalcOperation.subtract: "subtract",
+    CalcOperation.divide: "floor_divide",
+    CalcOperation.power: "power",
+}
+
+IntArray = Union[Sequence[int], "np.ndarray"]
+
+
+def calculate_many(
+    op: CalcOperation, xs: IntArray, ys: IntArray
+) -> "np.ma.MaskedArray":
+    """Calculate results of an operation on many pairs of integer numbers at once.
+
+    Gives the same results as calling `calculate` on each pair (`ys` can also be a
+    single number), but is evaluated vectorized with NumPy, using 64-bit integers.
+    The inputs must fit into 64-bit integers. Results that could overflow them are
+    computed exactly by `calculate` (then the result has `dtype=object`).
+    Pairs for which `calculate` would fail (e.g. division by zero) do not raise an
+    exception, instead their results are masked.
+
+    NumPy is an optional dependency, install `{{ cookiecutter.project_slug }}[numpy]`
+    to use this function.
+    """
+    try:
+        import numpy as np  # NOTE: only loaded when needed
+    except ImportError as e:
+        msg = "calculate_many needs NumPy, install {{ cookiecutter.project_slug }}[numpy]!"
+        raise ImportError(msg) from e
+
+    if not isinstance(op, CalcOperation):
+        raise ValueError(f"Unknown operation: {op}")
+    if op not in _UFUNC_NAMES:
+        err = f"Operation {op} is not implemented!"
+        raise NotImplementedError(err)
+
+    x, y = np.broadcast_arrays(
+        np.asarray(xs, dtype=np.int64), np.asarray(ys, dtype=np.int64)
+    )
+    if op == CalcOperation.divide:
+        invalid = y == 0
+    elif op == CalcOperation.power:
+        invalid = y < 0
+    else:
+        invalid = np.zeros(x.shape, dtype=bool)
+
+    # compute invalid entries with a harmless value, they are masked anyway
+    y_safe = np.where(invalid, 1, y)
+    ufunc = getattr(np, _UFUNC_NAMES[op])
+    result = np.asarray(ufunc(x, y_safe))
+
+    # 64-bit integers silently wrap around, so results are estimated with floats
+    # (which can represent large numbers) to find the ones that could overflow
+    with np.errstate(all="ignore"):
+        estimate = ufunc(x.astype(np.float64), y_safe.astype(np.float64))
+    overflow = ~invalid & ~(np.abs(estimate) < 2.0**62)
+    if overflow.any():
+        result = result.astype(object)
+        for i in np.flatnonzero(overflow):
+            result.flat[i] = calculate(op, int(x.flat[i]), int(y.flat[i]))
+    return np.ma.masked_array(result, mask=invalid)
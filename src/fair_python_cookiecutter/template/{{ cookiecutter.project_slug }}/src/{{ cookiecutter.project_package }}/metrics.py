@@ -0,0 +1,146 @@
+"""Request metrics of the API, exposed in the Prometheus text format.
+
+The middleware only does some counting per request, so it can stay enabled in
+production. All updates happen in the event loop, so no locking is needed.
+"""
+
+from bisect import bisect_left
+from collections import defaultdict
+from time import perf_counter
+from typing import Collection, DefaultDict, Dict, List, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+"""Content type of the Prometheus text format."""
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+"""Upper bounds (in seconds) of the latency histogram buckets."""
+
+UNMATCHED_ROUTE = "<unmatched>"
+"""Route label for requests that did not match any route (e.g. 404)."""
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Distribution of observed values over fixed buckets."""
+
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: Sequence[float]):
+        """Create empty histogram with given bucket upper bounds (sorted)."""
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last one is for +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+def _sample(name: str, labels: Labels, value) -> str:
+    """Return line with the value of a metric (with given labels)."""
+
+    def escape(v: str) -> str:
+        return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    if labels:
+        # NOTE: braces are not in f-strings, as the template of this file is rendered
+        name += "{" + ",".join(f'{k}="{escape(v)}"' for k, v in labels) + "}"
+    return f"{name} {value}"
+
+
+class Metrics:
+    """Latencies, in-flight requests and errors of the served HTTP requests."""
+
+    def __init__(
+        self,
+        *,
+        ops: Collection[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        """Create empty metrics.
+
+        The `op` path parameter of a request is used as a label if it is in `ops`.
+        """
+        self.ops = frozenset(ops)
+        self.buckets = tuple(sorted(buckets))
+        self.latency: Dict[Labels, Histogram] = {}
+        self.errors: DefaultDict[Labels, int] = defaultdict(int)
+        self.in_flight = 0
+
+    def observe(self, scope: dict, status: int, seconds: float):
+        """Record a finished request (the scope must be the one passed to the app)."""
+        # NOTE: the route template (not the path) keeps the number of labels bounded
+        route = scope.get("route")
+        route = getattr(route, "path", UNMATCHED_ROUTE)
+        op = scope.get("path_params", {}).get("op", "")
+        base = (("method", scope["method"]), ("route", route))
+
+        labels = base + (("op", op if op in self.ops else ""),)
+        if (hist := self.latency.get(labels)) is None:
+            hist = self.latency[labels] = Histogram(self.buckets)
+        hist.observe(seconds)
+        if status >= 400:
+            self.errors[base + (("status", str(status)),)] += 1
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text format."""
+        lines: List[str] = []
+        name = "http_request_duration_seconds"
+        lines += [
+            f"# HELP {name} Latency of HTTP requests.",
+            f"# TYPE {name} histogram",
+        ]
+        for labels, hist in sorted(self.latency.items()):
+            cumulative = 0
+            for bound, count in zip((*hist.bounds, "+Inf"), hist.counts):
+                cumulative += count
+                le = (("le", str(bound)),)
+                lines.append(_sample(f"{name}_bucket", labels + le, cumulative))
+            lines.append(_sample(f"{name}_sum", labels, hist.sum))
+            lines.append(_sample(f"{name}_count", labels, cumulative))
+
+        name = "http_requests_in_flight"
+        lines += [
+            f"# HELP {name} Number of HTTP requests currently being served.",
+            f"# TYPE {name} gauge",
+            _sample(name, (), self.in_flight),
+        ]
+
+        name = "http_request_errors_total"
+        lines += [
+            f"# HELP {name} Number of HTTP requests that failed (status >= 400).",
+            f"# TYPE {name} counter",
+        ]
+        for labels, count in sorted(self.errors.items()):
+            lines.append(_sample(name, labels, count))
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """ASGI middleware that records the metrics of all HTTP requests."""
+
+    def __init__(self, app, metrics: Metrics):
+        """Wrap an ASGI app, recording into given metrics."""
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = 500  # if the app fails before starting the response
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.metrics.in_flight += 1
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.metrics.in_flight -= 1
+            self.metrics.observe(scope, status, perf_counter() - start)
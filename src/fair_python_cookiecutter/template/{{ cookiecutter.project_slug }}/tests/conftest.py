@@ -1,5 +1,11 @@
 """Global pytest configuration."""
 
+import os
+from pathlib import Path
+
+from hypothesis import settings
+from hypothesis.database import DirectoryBasedExampleDatabase
+
 # NOTE: you can put your pytest fixtures here.
 #
 # Fixtures are very useful for automating repetitive test preparations
@@ -7,3 +13,22 @@
 # which are needed in multiple similar tests.
 #
 # see: https://docs.pytest.org/en/6.2.x/fixture.html
+
+# Hypothesis profiles: "dev" for quick local runs, "ci" for thorough runs in CI.
+# Select one with the HYPOTHESIS_PROFILE environment variable (default: "ci" if
+# the CI variable is set, as in GitHub and GitLab CI, otherwise "dev").
+#
+# All test processes (e.g. the workers of `poe test-fast`) share the same example
+# database in the project directory. This is safe, as each example is a separate
+# file that is written atomically, and failing examples found by any worker are
+# replayed first in the next run.
+example_db = DirectoryBasedExampleDatabase(
+    Path(__file__).resolve().parents[1] / ".hypothesis" / "examples"
+)
+settings.register_profile("dev", max_examples=20, database=example_db)
+settings.register_profile(
+    "ci", max_examples=500, deadline=None, print_blob=True, database=example_db
+)
+settings.load_profile(
+    os.environ.get("HYPOTHESIS_PROFILE", "ci" if os.environ.get("CI") else "dev")
+)
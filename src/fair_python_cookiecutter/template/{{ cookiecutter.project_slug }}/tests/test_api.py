@@ -1,7 +1,10 @@
 """Test API."""
+
+import json
+
 from fastapi.testclient import TestClient
 
-from {{ cookiecutter.project_package }}.api import app
+from {{ cookiecutter.project_package }}.api import LRUCache, app, result_cache
 
 client = TestClient(app)
 
@@ -18,5 +21,97 @@ def test_calculate():
     response = client.get("/calculate/add?x=3.14")
     assert response.status_code == 422  # float input
 
-    response = client.get("/calculate/power?x=5")
-    assert response.status_code == 422  # unsupported op
+    response = client.get("/calculate/power?x=5&y=-1")
+    assert response.status_code == 422  # negative power
+
+
+def test_calculate_large_power():
+    response = client.get("/calculate/power?x=2&y=10")
+    assert response.json() == 1024
+
+    response = client.get("/calculate/power?x=2&y=1000000")
+    assert response.status_code == 422  # result too large
+
+
+def test_calculate_caching():
+    result_cache.clear()
+    response = client.get("/calculate/multiply?x=6&y=7")
+    assert response.json() == 42
+    assert response.headers["X-Cache"] == "MISS"
+    assert "max-age" in response.headers["Cache-Control"]
+    etag = response.headers["ETag"]
+
+    response = client.get("/calculate/multiply?x=6&y=7")
+    assert response.json() == 42
+    assert response.headers["X-Cache"] == "HIT"
+    assert response.headers["ETag"] == etag  # ETags are stable
+    assert client.get("/calculate/multiply?x=7&y=6").headers["ETag"] != etag
+
+    # clients can revalidate their cached result
+    revalidate = {"If-None-Match": etag}
+    response = client.get("/calculate/multiply?x=6&y=7", headers=revalidate)
+    assert response.status_code == 304
+    assert not response.content
+    response = client.get("/calculate/add?x=6&y=7", headers=revalidate)
+    assert response.status_code == 200
+
+    stats = client.get("/cache").json()
+    assert stats["hits"] >= 1 and stats["misses"] >= 3
+
+
+def test_lru_cache():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == (True, 1)  # now "b" is the least recently used
+    cache.put("c", 3)
+    assert cache.get("b") == (False, None)
+    assert cache.get("c") == (True, 3)
+    assert cache.stats() == dict(maxsize=2, size=2, hits=2, misses=1, evictions=1)
+
+    disabled = LRUCache(0)
+    disabled.put("a", 1)
+    assert disabled.get("a") == (False, None)
+
+
+def chunked(data: bytes, size: int = 3):
+    """Yield body in small chunks, to check that it is parsed incrementally."""
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+def calc_batch(body: bytes):
+    response = client.post("/calculate/batch", content=chunked(body))
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_calculate_batch_ndjson():
+    body = b"\n".join(
+        [
+            b'{"op": "add", "x": 1, "y": 2}',
+            b'{"op": "divide", "x": 1, "y": 0}',
+            b'{"op": "invalid", "x": 1}',
+            b'{"op": "add", "x": 1',  # invalid JSON
+            b"",  # empty lines are ignored
+            b'{"op": "multiply", "x": 6, "y": 7}',
+        ]
+    )
+    results = calc_batch(body)
+    assert len(results) == 5
+    assert results[0] == {"result": 3}
+    assert "y=0" in results[1]["error"]
+    assert results[2]["error"].startswith("op:")
+    assert "Invalid JSON" in results[3]["error"]
+    assert results[4] == {"result": 42}  # errors do not abort the batch
+
+
+def test_calculate_batch_json_array():
+    items = [{"op": "subtract", "x": i, "y": 1} for i in range(100)]
+    results = calc_batch(json.dumps(items).encode())
+    assert results == [{"result": i - 1} for i in range(100)]
+
+    results = calc_batch(b'[{"op": "add", "x": 1}, {"op": "add", "x": 2}')
+    assert results[:2] == [{"result": 1}, {"result": 2}]
+    assert "end of JSON array" in results[2]["error"]  # missing closing bracket
@@ -17,6 +17,43 @@ def test_calc_addition():
     assert result.stdout.strip() == "Result: 42"
 
 
+CALC_LINES = """\
+add 20 22
+# comments and empty lines are ignored
+
+divide 7 0
+multiply 6 7
+power 2 -1
+modulo 1 2
+subtract 50 8
+power 10 99999999
+"""
+
+
+def test_calc_stream_errors_do_not_stop():
+    result = runner.invoke(app, ["calc-stream"], input=CALC_LINES)
+
+    assert result.exit_code == 1
+    assert result.stdout.split() == ["42", "42", "42"]
+    assert "Line 4: Cannot divide x=7 by y=0!" in result.stderr
+    assert "Line 6: Cannot raise x=2 to negative power y=-1!" in result.stderr
+    assert "Line 7: Unknown operation: modulo" in result.stderr
+    assert "Line 9: Result of x=10 to the power y=99999999" in result.stderr
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_calc_stream_keeps_order(tmp_path, jobs: int):
+    lines = [f"add {i} 1" for i in range(500)]
+    path = tmp_path / "calcs.txt"
+    path.write_text("\n".join(lines))
+
+    args = ["calc-stream", str(path), "--jobs", str(jobs), "--chunk-size", "7"]
+    result = runner.invoke(app, args)
+
+    assert result.exit_code == 0
+    assert result.stdout.split() == [str(i + 1) for i in range(500)]
+
+
 person_names = ["Jane", "John"]
 
 
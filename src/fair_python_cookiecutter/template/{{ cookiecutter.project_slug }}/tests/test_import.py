@@ -0,0 +1,55 @@
+"""Tests for the time and modules needed to import the package."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import {{ cookiecutter.project_package }}
+
+# budgets for importing the package (can be overridden, e.g. for slow machines)
+IMPORT_BUDGET_MS = float(os.environ.get("{{ cookiecutter.project_package | upper }}_IMPORT_BUDGET_MS", 50))
+IMPORT_BUDGET_MODULES = int(os.environ.get("{{ cookiecutter.project_package | upper }}_IMPORT_BUDGET_MODULES", 10))
+
+IMPORT_CODE = """
+import json, sys, time
+before = set(sys.modules)
+start = time.perf_counter()
+import {{ cookiecutter.project_package }}
+took = time.perf_counter() - start
+print(json.dumps({"ms": took * 1000, "modules": sorted(set(sys.modules) - before)}))
+"""
+
+
+def import_package():
+    """Import the package in a fresh interpreter, return time (in ms) and new modules."""
+    # make sure the same package is imported (also if it is not installed)
+    src_dir = str(Path({{ cookiecutter.project_package }}.__file__).parents[1])
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [src_dir, env.get("PYTHONPATH")]))
+    cmd = [sys.executable, "-c", IMPORT_CODE]
+    proc = subprocess.run(cmd, env=env, capture_output=True, text=True, check=True)  # noqa: S603
+    result = json.loads(proc.stdout)
+    return result["ms"], result["modules"]
+
+
+@pytest.mark.timing
+def test_import_budget():
+    # take the best of a few runs to reduce noise
+    runs = [import_package() for _ in range(3)]
+    best = min(ms for ms, _ in runs)
+    _, modules = runs[0]
+
+    assert best < IMPORT_BUDGET_MS, f"Import took {best:.1f} ms"
+    assert len(modules) <= IMPORT_BUDGET_MODULES, f"Imported modules: {modules}"
+
+
+def test_lazy_attributes():
+    # submodules are imported when they are used
+    for name in {{ cookiecutter.project_package }}.__all__:
+        assert getattr({{ cookiecutter.project_package }}, name) is not None
+        assert name in dir({{ cookiecutter.project_package }})
+    assert {{ cookiecutter.project_package }}.lib.__name__ == "{{ cookiecutter.project_package }}.lib"
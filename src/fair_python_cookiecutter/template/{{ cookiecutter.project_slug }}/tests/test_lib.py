@@ -1,10 +1,13 @@
 """Test for core library."""
 
+import sys
+
+import numpy as np
 import pytest
 from hypothesis import assume, given
 from hypothesis import strategies as st
 
-from {{ cookiecutter.project_package }}.lib import CalcOperation, calculate
+from {{ cookiecutter.project_package }}.lib import CalcOperation, calculate, calculate_many
 
 
 def test_calculate_invalid():
@@ -14,8 +17,8 @@ def test_calculate_invalid():
     with pytest.raises(ValueError):
         calculate("invalid", 123, 0)  # type: ignore
 
-    with pytest.raises(NotImplementedError):
-        calculate(CalcOperation.power, 2, 3)
+    with pytest.raises(ValueError):
+        calculate(CalcOperation.power, 2, -3)
 
 
 # Example of how hypothesis can be used to generate different
@@ -28,8 +31,65 @@ def test_calculate(op, x, y):
     # if the assumption is violated, the test instance is skipped.
     # (better: use strategy combinators for filtering)
     assume(op != CalcOperation.divide or y != 0)
-    assume(op != CalcOperation.power)  # not supported
+    assume(op != CalcOperation.power or 0 <= y <= 100)  # avoid huge numbers
 
     # we basically just check that there is no exception and the type is right
     result = calculate(op, x, y)
     assert isinstance(result, int)
+
+
+def test_calculate_many():
+    result = calculate_many(CalcOperation.divide, [7, 8, 9], np.array([2, 0, 3]))
+    assert result.tolist() == [3, None, 3]  # masked result of division by zero
+
+    result = calculate_many(CalcOperation.power, [2, 3], 2)  # y is broadcast
+    assert result.tolist() == [4, 9]
+
+    # results that do not fit into 64-bit integers are computed exactly
+    big = 2**62
+    result = calculate_many(CalcOperation.multiply, [big, 2], [4, 3])
+    assert result.tolist() == [2**64, 6]
+    assert calculate_many(CalcOperation.add, big, big).tolist() == 2**63
+    assert calculate_many(CalcOperation.power, [10], [30]).tolist() == [10**30]
+
+    with pytest.raises(ValueError):
+        calculate_many("invalid", [1], [2])  # type: ignore
+    with pytest.raises(ValueError):
+        calculate_many(CalcOperation.add, [1, 2], [1, 2, 3])  # incompatible shapes
+
+
+def test_calculate_many_without_numpy(monkeypatch):
+    monkeypatch.setitem(sys.modules, "numpy", None)  # as if it was not installed
+    with pytest.raises(ImportError, match=r"\[numpy\]"):
+        calculate_many(CalcOperation.add, [1], [2])
+
+
+# Example of building strategies from other strategies:
+# the inputs are restricted to 64-bit integers (and small powers).
+
+int64s = st.integers(min_value=-(2**63), max_value=2**63 - 1)
+
+
+@st.composite
+def operation_with_inputs(draw):
+    op = draw(st.sampled_from(CalcOperation))
+    xs, ys = int64s, int64s
+    if op == CalcOperation.power:
+        xs = st.integers(min_value=-10, max_value=10)
+        ys = st.integers(min_value=-3, max_value=100)
+    pairs = draw(st.lists(st.tuples(xs, ys)))
+    return op, [x for x, _ in pairs], [y for _, y in pairs]
+
+
+@given(operation_with_inputs())
+def test_calculate_many_like_calculate(inputs):
+    op, xs, ys = inputs
+    result = calculate_many(op, xs, ys)
+    assert len(result) == len(xs)
+
+    for x, y, res in zip(xs, ys, result.tolist()):
+        try:
+            expected = calculate(op, x, y)
+        except (ZeroDivisionError, ValueError):
+            expected = None  # failed computations are masked
+        assert res == expected
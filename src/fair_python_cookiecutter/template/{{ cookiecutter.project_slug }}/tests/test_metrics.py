@@ -0,0 +1,108 @@
+"""Test API metrics."""
+
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from {{ cookiecutter.project_package }}.api import app, metrics
+from {{ cookiecutter.project_package }}.metrics import Metrics, MetricsMiddleware
+
+client = TestClient(app)
+
+
+def sample(name: str, labels: str) -> str:
+    return name + "{" + labels + "}"
+
+
+def test_metrics_endpoint():
+    client.get("/calculate/add?x=1&y=2")
+    client.get("/calculate/divide?x=1&y=0")
+    client.get("/does-not-exist")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+
+    route = 'method="GET",route="/calculate/{op}"'
+    count = sample("http_request_duration_seconds_count", route + ',op="add"')
+    assert count + " " in text
+    errors = sample("http_request_errors_total", route + ',status="422"')
+    assert errors + " " in text
+    assert 'route="<unmatched>",status="404"' in text
+    assert "http_requests_in_flight 1" in text  # the request for the metrics
+    assert metrics.in_flight == 0
+
+
+def test_histogram_buckets():
+    m = Metrics(ops=["add"], buckets=[0.1, 1])
+    scope = {"method": "GET", "path_params": {"op": "add"}}
+    for seconds in [0.05, 0.1, 0.5, 2]:
+        m.observe(scope, 200, seconds)
+    m.observe({"method": "GET", "path_params": {"op": "unknown"}}, 500, 0)
+
+    text = m.render()
+    lbl = 'method="GET",route="<unmatched>",op="add"'
+    name = "http_request_duration_seconds"
+    assert sample(f"{name}_bucket", lbl + ',le="0.1"') + " 2\n" in text
+    assert sample(f"{name}_bucket", lbl + ',le="1"') + " 3\n" in text
+    assert sample(f"{name}_bucket", lbl + ',le="+Inf"') + " 4\n" in text
+    assert sample(f"{name}_sum", lbl) + " 2.65\n" in text
+    assert 'op=""' in text  # unknown ops are not used as labels
+    assert 'status="500"} 1' in text
+
+
+async def plain_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def test_middleware_passes_through():
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    m = Metrics()
+    scope = {"type": "http", "method": "GET", "path_params": {}}
+    asyncio.run(MetricsMiddleware(plain_app, m)(scope, None, send))
+    assert sent[0]["status"] == 200
+    assert sent[-1]["body"] == b"ok"
+    assert sum(sum(hist.counts) for hist in m.latency.values()) == 1
+    assert not m.errors
+    assert m.in_flight == 0
+
+    # other connections (e.g. lifespan) are not recorded
+    asyncio.run(MetricsMiddleware(plain_app, m)({"type": "lifespan"}, None, send))
+    assert sum(sum(hist.counts) for hist in m.latency.values()) == 1
+
+
+async def noop_send(message):
+    pass
+
+
+def best_time(asgi_app, n: int = 2000, repeat: int = 5) -> float:
+    """Return the best time (in seconds) of serving n requests with the ASGI app."""
+
+    async def serve_all():
+        for _ in range(n):
+            scope = {"type": "http", "method": "GET", "path_params": {}}
+            await asgi_app(scope, None, noop_send)
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        asyncio.run(serve_all())
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+@pytest.mark.timing
+def test_middleware_overhead():
+    # measured relative to a minimal app without any HTTP handling, so the bound is
+    # generous - compared to real request handling, the overhead is negligible
+    plain = best_time(plain_app)
+    wrapped = best_time(MetricsMiddleware(plain_app, Metrics()))
+    assert wrapped < 10 * plain, f"Overhead: {wrapped / plain:.1f}x"
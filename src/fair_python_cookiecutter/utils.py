@@ -1,17 +1,21 @@
 """Utilities for creation of template repository instances."""
 
+import hashlib
 import json
+import os
 import platform
 import shutil
 import subprocess
 import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
 from uuid import uuid1
 
-from importlib_resources import files
-from platformdirs import user_runtime_path
+from importlib_resources import as_file, files
+from platformdirs import user_cache_path, user_runtime_path
 
+from . import __version__
 from .config import CookiecutterJson
 
 
@@ -45,37 +49,75 @@ class TempDir:
 TEMPLATE_DIR = files("fair_python_cookiecutter") / "template"
 
 
-def copy_template(
-    tmp_dir: Optional[Path] = None, *, cookiecutter_json: CookiecutterJson = None
-) -> Path:
-    """Create final template based on given configuration, returns template root directory."""
-    # if no config is given, use dummy default values (useful for testing)
-    if not cookiecutter_json:
-        with open(TEMPLATE_DIR / "cookiecutter.json", "r") as ccjson:
-            ccjson_dct = json.load(ccjson)
-            cookiecutter_json = CookiecutterJson.model_validate(ccjson_dct)
-
-    # copy the meta-template (we do not fully hardcode the paths for robustness)
-    template_root = None
-    for path in TEMPLATE_DIR.glob("*"):
-        trg_path = tmp_dir / path.name
-        if path.is_dir():
-            if path.name.startswith("{{ cookiecutter"):
-                template_root = path
+def user_cache_dir() -> Path:
+    """Return directory for persistent caches of this tool (created if missing)."""
+    return user_cache_path("fair-python-cookiecutter", ensure_exists=True)
 
-            shutil.copytree(path, trg_path)
-        else:
-            shutil.copyfile(path, trg_path)
 
-    # write a fresh cookiecutter.json based on user configuration
-    with open(tmp_dir / "cookiecutter.json", "w", encoding="utf-8") as f:
-        f.write(cookiecutter_json.model_dump_json(indent=2, by_alias=True))
+def template_defaults() -> Dict[str, Any]:
+    """Return the default values of the template variables (from its cookiecutter.json)."""
+    with open(TEMPLATE_DIR / "cookiecutter.json", "r", encoding="utf-8") as f:
+        return json.load(f)
 
-    if not template_root:
-        raise RuntimeError(
-            "Template root directory not identified, this must be a bug!"
+
+@lru_cache(maxsize=None)
+def template_hash() -> str:
+    """Return a hash over all file paths and contents of the template.
+
+    The paths are relative to the template, so the hash does not depend on where
+    the tool is installed.
+    """
+    h = hashlib.sha256()
+    pending = [(TEMPLATE_DIR, "")]
+    while pending:
+        path, rel_path = pending.pop()
+        if path.is_dir():
+            children = sorted(path.iterdir(), key=lambda p: p.name, reverse=True)
+            pending.extend((p, f"{rel_path}/{p.name}".lstrip("/")) for p in children)
+        else:
+            h.update(rel_path.encode("utf-8"))
+            h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def jinja_cache_dir() -> Path:
+    """Return directory for compiled templates (for the current tool version and template).
+
+    Caches for other versions or template states are removed.
+    """
+    cache_root = user_cache_dir() / "jinja"
+    cache_dir = cache_root / f"{__version__}-{template_hash()[:16]}"
+    if not cache_dir.is_dir() and cache_root.is_dir():
+        for stale in cache_root.iterdir():
+            # NOTE: other processes (e.g. batch workers) could have just created it
+            if stale.name != cache_dir.name:
+                shutil.rmtree(stale, ignore_errors=True)
+    # (re-)create it right before use, in case another process removed it
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+def render_template(
+    cookiecutter_json: CookiecutterJson, output_dir: Path, **kwargs
+) -> Path:
+    """Render the template directly from the package resources, returns project directory.
+
+    The cookiecutter.json is not written anywhere, but passed as in-memory context.
+    Compiled templates are cached on disk, so they are only compiled once.
+    Additional keyword arguments are passed to `cookiecutter.generate.generate_files`.
+    """
+    from cookiecutter.generate import generate_files
+    from jinja2 import FileSystemBytecodeCache
+
+    context = {"cookiecutter": cookiecutter_json.model_dump(by_alias=True)}
+    bytecode_cache = FileSystemBytecodeCache(str(jinja_cache_dir()))
+    context["cookiecutter"]["_jinja2_env_vars"] = {"bytecode_cache": bytecode_cache}
+    # NOTE: as_file only extracts the template if the package is not a directory (e.g. zip)
+    with as_file(TEMPLATE_DIR) as template_dir:
+        project_dir = generate_files(
+            repo_dir=template_dir, context=context, output_dir=output_dir, **kwargs
         )
-    return template_root
+    return Path(project_dir)
 
 
 def get_venv_path() -> Optional[Path]:
@@ -87,6 +129,21 @@ VENV_PATH: Optional[Path] = get_venv_path()
 """If set, the path of the virtual environment this tool is running in."""
 
 
+def deactivated_venv_env() -> Dict[str, str]:
+    """Return a copy of the environment without an active virtual environment.
+
+    This makes sure that tools like poetry use the environment of the new project.
+    """
+    env = dict(os.environ)
+    venv = env.pop("VIRTUAL_ENV", None) or VENV_PATH
+    env.pop("VIRTUAL_ENV_PROMPT", None)
+    if venv:
+        bin_dir = Path(venv) / ("Scripts" if platform.system() == "Windows" else "bin")
+        paths = env.get("PATH", "").split(os.pathsep)
+        env["PATH"] = os.pathsep.join(p for p in paths if p and Path(p) != bin_dir)
+    return env
+
+
 def venv_activate_cmd(venv_path: Path):
     if platform.system() != "Windows":
         return "source " + str(venv_path / "bin" / "activate")
@@ -0,0 +1,194 @@
+"""Benchmarks of the repository generation, excluding the external tools.
+
+All commands of the post-generation pipeline (git, poetry, pre-commit, ...) are
+replaced by stand-ins that only record the call, so the measured time is the
+overhead of the generator itself.
+
+Usage:
+    python tests/benchmark.py --save     # run and store results as baseline
+    python tests/benchmark.py            # run and compare with the baseline
+"""
+
+import argparse
+import io
+import json
+import platform
+import sys
+import time
+from contextlib import ExitStack, redirect_stdout
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from unittest import mock
+
+from fair_python_cookiecutter import __version__, depcache, licenses, main
+from fair_python_cookiecutter.config import CookiecutterConfig, CookiecutterJson
+from fair_python_cookiecutter.pipeline import Pipeline
+from fair_python_cookiecutter.utils import TempDir, render_template
+
+DEMO_CONFIG = Path(__file__).parent / "demo.yaml"
+BASELINE_FILE = Path(".benchmarks") / "baseline.json"
+
+TOLERANCE = 0.25
+"""Relative slowdown (compared to the baseline) that is considered a regression."""
+
+MIN_DELTA = 0.01
+"""Absolute slowdown (in seconds) below which differences are considered noise."""
+
+
+class StandIns:
+    """Replaces external commands and caches by fast, deterministic stand-ins."""
+
+    def __init__(self, cache_dir: Path):
+        """Prepare stand-ins, using given directory for all persistent caches."""
+        self.cache_dir = cache_dir
+        self.commands: List[str] = []
+        self._stack = ExitStack()
+
+    def record(self, pipeline: Pipeline, cmd, cwd: Optional[Path] = None):
+        """Record a command, simulating the side effects needed by later steps."""
+        cmd = cmd if isinstance(cmd, str) else " ".join(cmd)
+        self.commands.append(cmd)
+        if cmd.startswith("poetry install"):
+            ((cwd or pipeline.cwd) / "poetry.lock").write_text("# stand-in\n")
+
+    def __enter__(self):
+        """Activate the stand-ins."""
+
+        def run_cmd(pipeline, cmd, *, cwd=None):
+            self.record(pipeline, cmd, cwd)
+
+        patch = self._stack.enter_context
+        patch(mock.patch.object(Pipeline, "run_cmd", run_cmd))
+        patch(mock.patch.object(main, "check_prerequisites", lambda: None))
+        patch(mock.patch.object(main, "missing_hook_envs", lambda: []))
+        for mod in [licenses, depcache]:
+            patch(mock.patch.object(mod, "user_cache_dir", lambda: self.cache_dir))
+        patch(redirect_stdout(io.StringIO()))  # progress output of the pipeline
+        return self
+
+    def __exit__(self, *exc):
+        """Restore the original functions."""
+        self._stack.close()
+
+
+def best_time(
+    func: Callable[[], None], *, repeat: int, setup: Optional[Callable] = None
+) -> float:
+    """Return the fastest of multiple runs (in seconds), setup is not measured."""
+    times = []
+    for _ in range(repeat):
+        args = [setup()] if setup else []
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run_benchmarks(work_dir: Path, *, repeat: int = 5) -> Dict[str, float]:
+    """Run all benchmarks in given (empty) directory, returns timings by name."""
+    conf = CookiecutterConfig.load(config_file=DEMO_CONFIG)
+    conf.fair_python_cookiecutter.project_license = "MIT"  # bundled, no download
+    conf.fair_python_cookiecutter.infer_from_repo_url(
+        "https://github.com/MyOrg/my-project"
+    )
+    cc_json = CookiecutterJson.from_config(conf)
+
+    runs = iter(range(sys.maxsize))
+
+    def fresh_dir() -> Path:
+        path = work_dir / f"run{next(runs)}"
+        path.mkdir()
+        return path
+
+    results = {}
+    results["from_config"] = best_time(
+        lambda: CookiecutterJson.from_config(conf), repeat=repeat
+    )
+    results["generated_files"] = best_time(
+        lambda: main.generated_files(cc_json), repeat=repeat
+    )
+    results["render_template"] = best_time(
+        lambda path: render_template(cc_json, path),
+        setup=fresh_dir,
+        repeat=repeat,
+    )
+    with StandIns(work_dir / "cache") as standins:
+        results["finalize_repository"] = best_time(
+            lambda proj_root: main.finalize_repository(proj_root, conf),
+            setup=lambda: render_template(cc_json, fresh_dir()),
+            repeat=repeat,
+        )
+        results["create_repository"] = best_time(
+            lambda path: main.create_repository(conf, path),
+            setup=fresh_dir,
+            repeat=repeat,
+        )
+    if not any(cmd.startswith("poetry run git commit") for cmd in standins.commands):
+        raise RuntimeError("Post-generation pipeline did not run completely!")
+    return results
+
+
+def environment() -> Dict[str, str]:
+    """Return information about the environment the benchmarks were run in."""
+    return {
+        "fpc_version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+
+def compare(
+    current: Dict[str, float],
+    baseline: Dict[str, float],
+    *,
+    tolerance: float = TOLERANCE,
+    min_delta: float = MIN_DELTA,
+) -> List[str]:
+    """Return descriptions of all regressions of current timings w.r.t. the baseline."""
+    regressions = []
+    for name, secs in current.items():
+        if (base := baseline.get(name)) is None:
+            continue
+        if secs > base * (1 + tolerance) and secs - base > min_delta:
+            slowdown = f", +{(secs / base - 1) * 100:.0f}%" if base > 0 else ""
+            regressions.append(
+                f"{name}: {secs * 1000:.1f} ms (baseline: {base * 1000:.1f} ms{slowdown})"
+            )
+    return regressions
+
+
+def main_cli(args=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--save", action="store_true", help="Store as new baseline.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    opts = parser.parse_args(args)
+
+    with TempDir() as work_dir:
+        results = run_benchmarks(work_dir, repeat=opts.repeat)
+    for name, secs in results.items():
+        print(f"{name:>24}: {secs * 1000:8.2f} ms")
+
+    if opts.save:
+        opts.baseline.parent.mkdir(parents=True, exist_ok=True)
+        report = {"environment": environment(), "results": results}
+        opts.baseline.write_text(json.dumps(report, indent=2))
+        print(f"Baseline saved in {opts.baseline}")
+        return 0
+
+    if not opts.baseline.is_file():
+        print(f"No baseline found in {opts.baseline}, run with --save first!")
+        return 1
+    baseline = json.loads(opts.baseline.read_text())
+    if baseline["environment"] != environment():
+        print("WARNING: baseline was created in a different environment!")
+    if regressions := compare(results, baseline["results"], tolerance=opts.tolerance):
+        print("Regressions:", *regressions, sep="\n  ")
+        return 1
+    print("No regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,103 @@
+import pytest
+
+from fair_python_cookiecutter import batch
+from fair_python_cookiecutter.batch import (
+    BatchManifest,
+    configure,
+    create_repositories,
+    parse_shard,
+    preview_repositories,
+    select_shard,
+)
+from fair_python_cookiecutter.config import CookiecutterConfig
+
+
+def test_load_manifest(tmp_path):
+    manifest_file = tmp_path / "manifest.yaml"
+    manifest_file.write_text(
+        "output_dir: out\nprojects:\n  - project_repo_url: https://github.com/a/b\n"
+    )
+    manifest = BatchManifest.load(manifest_file)
+    assert manifest.output_dir == tmp_path / "out"
+    assert manifest.projects == [{"project_repo_url": "https://github.com/a/b"}]
+
+    # plain list is also accepted
+    manifest_file.write_text("- project_slug: x\n- project_slug: y\n")
+    manifest = BatchManifest.load(manifest_file)
+    assert manifest.output_dir is None
+    assert len(manifest.projects) == 2
+
+
+def test_shard():
+    assert parse_shard("2/3") == (2, 3)
+    for invalid in ["0/3", "4/3", "1", "a/b"]:
+        with pytest.raises(ValueError):
+            parse_shard(invalid)
+
+    items = list(range(10))
+    shards = [select_shard(items, (i, 3)) for i in range(1, 4)]
+    assert sorted(sum(shards, [])) == items
+    assert select_shard(items, None) == items
+
+
+def test_configure():
+    base = CookiecutterConfig.load(config_file="./tests/demo.yaml")
+    conf = configure(
+        base,
+        {"project_repo_url": "https://github.com/MyOrg/my-project", "init_api": False},
+    )
+    pconf = conf.fair_python_cookiecutter
+    assert pconf.project_slug == "my-project"
+    assert pconf.project_org == "MyOrg"
+    assert not pconf.init_api
+    # base config is not modified
+    assert base.fair_python_cookiecutter.init_api
+
+    with pytest.raises(ValueError):
+        configure(base, {"project_repo_url": "https://github.com/a/b", "foo": 1})
+
+
+def test_create_repositories(tmp_path, monkeypatch):
+    finalized = []
+
+    def finalize_repository(path, conf, *, name):
+        assert name == path.name  # messages are prefixed with the project
+        finalized.append(path.name)
+
+    monkeypatch.setattr(batch, "check_prerequisites", lambda: None)
+    monkeypatch.setattr(batch, "finalize_repository", finalize_repository)
+
+    base = CookiecutterConfig.load(config_file="./tests/demo.yaml")
+    manifest = [
+        {"project_repo_url": "https://github.com/MyOrg/first"},
+        {"project_repo_url": "https://github.com/MyOrg/second"},
+        {"project_repo_url": "https://github.com/MyOrg/first"},  # duplicate
+        {"project_repo_url": "https://github.com/MyOrg/third", "email": "invalid"},
+    ]
+    results = create_repositories(base, manifest, tmp_path, workers=2)
+
+    assert sorted(finalized) == ["first", "second"]
+    assert (tmp_path / "first" / "pyproject.toml").is_file()
+    assert len(results) == len(manifest)
+    ok = sorted(str(r.path.relative_to(tmp_path)) for r in results if r.ok)
+    assert ok == ["first", "second"]
+    failed = sorted(r.project_slug for r in results if not r.ok)
+    assert failed == ["#3", "first"]  # invalid and duplicate entries
+
+
+def test_preview_repositories(tmp_path):
+    base = CookiecutterConfig.load(config_file="./tests/demo.yaml")
+    manifest = [
+        {"project_repo_url": "https://github.com/MyOrg/first"},
+        {"project_repo_url": "https://github.com/MyOrg/second", "init_api": False},
+        {"project_repo_url": "https://github.com/MyOrg/third", "email": "invalid"},
+    ]
+    results = preview_repositories(base, manifest, tmp_path)
+
+    assert not list(tmp_path.iterdir())  # nothing was written
+    by_slug = {r.project_slug: r for r in results}
+    assert sorted(by_slug) == ["#2", "first", "second"]
+    assert not by_slug["#2"].ok
+    assert by_slug["first"].path == tmp_path / "first"
+    first, second = by_slug["first"].manifest, by_slug["second"].manifest
+    assert len(first.files) == len(second.files) + 4  # no API modules and tests
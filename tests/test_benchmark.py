@@ -0,0 +1,39 @@
+import json
+
+from benchmark import compare, main_cli, run_benchmarks
+
+
+def test_compare():
+    baseline = {"fast": 0.001, "slow": 1.0, "removed": 1.0}
+    current = {"fast": 0.002, "slow": 1.5, "new": 1.0}
+    # small absolute differences are considered noise
+    regressions = compare(current, baseline)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("slow: 1500.0 ms")
+    assert not compare(current, baseline, tolerance=1)
+
+
+def test_run_benchmarks(tmp_path):
+    results = run_benchmarks(tmp_path, repeat=1)
+    assert set(results) == {
+        "from_config",
+        "generated_files",
+        "render_template",
+        "finalize_repository",
+        "create_repository",
+    }
+    assert all(secs > 0 for secs in results.values())
+
+
+def test_baseline(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    assert main_cli(["--baseline", str(baseline), "--repeat", "1"]) == 1  # missing
+    assert main_cli(["--baseline", str(baseline), "--repeat", "1", "--save"]) == 0
+    report = json.loads(baseline.read_text())
+    assert report["environment"]["python"]
+
+    # pretend that everything was much faster before
+    report["results"] = {name: 0 for name in report["results"]}
+    report["results"]["render_template"] = 1e-6
+    baseline.write_text(json.dumps(report))
+    assert main_cli(["--baseline", str(baseline), "--repeat", "1"]) == 1
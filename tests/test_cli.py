@@ -0,0 +1,26 @@
+from typer.testing import CliRunner
+
+from fair_python_cookiecutter.cli import app
+
+
+def test_command_name_is_also_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "update").mkdir()
+
+    result = CliRunner().invoke(app, ["update"])
+    assert result.exit_code == 2
+    assert "Use './update'" in result.output
+
+
+def test_default_command():
+    result = CliRunner().invoke(app, ["./update", "--help"])
+    assert result.exit_code == 0
+    assert "Create a new project from the template" in result.output
+
+
+def test_batch_profile(tmp_path):
+    manifest = tmp_path / "batch.yaml"
+    manifest.write_text("[]")
+    result = CliRunner().invoke(app, ["--batch", str(manifest), "--profile"])
+    assert result.exit_code == 1
+    assert "Profiling is not supported in batch mode!" in result.output
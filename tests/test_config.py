@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from fair_python_cookiecutter.config import CookiecutterConfig, FPCConfig
+
+
+@pytest.fixture
+def base():
+    return CookiecutterConfig.load(
+        config_file="./tests/demo.yaml"
+    ).fair_python_cookiecutter
+
+
+def test_from_overrides_same_as_assignments(base):
+    url = "https://gitlab.com/MyGroup/sub/my-project"
+    expected = base.model_copy(deep=True)
+    expected.infer_from_repo_url(url)
+    expected.infer_from_output_dir(Path("out/My Project"))
+    expected.init_cli = False
+
+    conf = FPCConfig.from_overrides(
+        base, {"init_cli": False}, repo_url=url, output_dir=Path("out/My Project")
+    )
+    assert conf == expected
+    assert conf.project_slug == "my-project"
+    assert (
+        str(conf.project_pages_url) == "https://mygroup.pages.gitlab.io/sub/my-project"
+    )
+    assert base.init_cli  # base is not modified
+
+
+def test_from_overrides_infers_repo_url():
+    conf = FPCConfig.from_overrides(
+        None,
+        {"project_hoster": "github.com", "project_org": "a", "project_slug": "b"},
+    )
+    assert str(conf.project_repo_url) == "https://github.com/a/b"
+    # explicit overrides win over inferred values
+    conf = FPCConfig.from_overrides(
+        None, {"project_repo_url": "https://github.com/a/b", "project_slug": "c"}
+    )
+    assert conf.project_slug == "c"
+    assert str(conf.project_repo_url) == "https://github.com/a/b"
+
+
+def test_from_overrides_reports_all_errors(base):
+    with pytest.raises(ValueError, match="Unknown setting: foo"):
+        FPCConfig.from_overrides(base, {"foo": 1})
+
+    overrides = {
+        "project_repo_url": "not a url",
+        "email": "invalid",
+        "project_license": "nope",
+    }
+    with pytest.raises(ValidationError) as e:
+        FPCConfig.from_overrides(base, overrides)
+    assert {err["loc"][0] for err in e.value.errors()} == set(overrides)
+
+
+def test_is_default(base):
+    assert FPCConfig().is_default()
+    conf = FPCConfig()
+    conf.project_name = "excluded from the config"
+    assert conf.is_default()
+    conf.init_cli = True
+    assert not conf.is_default()
+    assert not base.is_default()
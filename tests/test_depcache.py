@@ -0,0 +1,127 @@
+import shutil
+from itertools import product
+
+import pytest
+
+from fair_python_cookiecutter import depcache, licenses, main
+from fair_python_cookiecutter.config import CookiecutterConfig
+from fair_python_cookiecutter.depcache import (
+    DependencyCache,
+    lock_requirements,
+    variant_name,
+    warm_cache,
+)
+from fair_python_cookiecutter.pipeline import Pipeline
+
+POETRY_LOCK = """
+[[package]]
+name = "click"
+version = "8.1.7"
+groups = ["main"]
+
+[[package]]
+name = "colorama"
+version = "0.4.6"
+groups = ["main", "dev"]
+markers = {main = "platform_system == \\"Windows\\"", dev = "sys_platform == \\"win32\\""}
+
+[[package]]
+name = "tomli"
+version = "2.0.1"
+groups = ["dev"]
+markers = "python_version < \\"3.11\\""
+"""
+
+
+def test_lock_requirements():
+    assert lock_requirements(POETRY_LOCK) == [
+        "click==8.1.7",
+        'colorama==0.4.6 ; (platform_system == "Windows") or (sys_platform == "win32")',
+        'tomli==2.0.1 ; python_version < "3.11"',
+    ]
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(depcache, "user_cache_dir", lambda: tmp_path / "cache")
+    return DependencyCache()
+
+
+def test_locks(tmp_path, cache, monkeypatch):
+    variant = variant_name(True, False, False)
+    assert variant == "cli-1_api-0_bench-0"
+    proj_root = tmp_path / "proj"
+    proj_root.mkdir()
+    assert not cache.restore_lock(proj_root, variant)
+
+    (proj_root / "poetry.lock").write_text(POETRY_LOCK)
+    cache.store_lock(proj_root, variant)
+    (proj_root / "poetry.lock").unlink()
+    assert cache.restore_lock(proj_root, variant)
+    assert (proj_root / "poetry.lock").read_text() == POETRY_LOCK
+
+    assert not cache.is_offline_ready(variant)
+    assert cache.pending_requirements(variant).is_file()
+    assert not cache.is_offline_ready(variant)
+    cache.mark_offline_ready(variant)
+    assert cache.is_offline_ready(variant)
+
+    # new projects are installed from the wheelhouse
+    ran = []
+    monkeypatch.setattr(Pipeline, "run_cmd", lambda self, cmd, **_: ran.append(cmd))
+    conf = CookiecutterConfig()
+    conf.fair_python_cookiecutter.init_cli = True
+    main.post_gen_pipeline(proj_root, conf).steps["poetry_install"].action()
+    assert ran[0][-4:] == [
+        "-f",
+        str(cache.wheels),
+        "-r",
+        str(cache.requirements_file(variant)),
+    ]
+    assert ran[1] == "poetry install --with docs"
+
+
+def test_warm_cache(tmp_path, cache, monkeypatch):
+    ran = []
+    downloaded = []
+
+    def fetch(spdx_id):
+        downloaded.append(spdx_id)
+        return f"text of {spdx_id}"
+
+    monkeypatch.setattr(licenses, "user_cache_dir", lambda: tmp_path / "cache")
+    monkeypatch.setattr(licenses, "fetch_license_text", fetch)
+
+    def run_cmd(self, cmd, *, cwd=None):
+        ran.append(cmd)
+        if cmd == "poetry lock":
+            (cwd / "poetry.lock").write_text(POETRY_LOCK)
+
+    monkeypatch.setattr(Pipeline, "run_cmd", run_cmd)
+    missing_hooks = ["https://example.com/hooks@v1"]
+    monkeypatch.setattr(depcache, "missing_hook_envs", lambda: missing_hooks)
+    results = warm_cache()
+    assert len(results) == 16 + 2 + 1
+    assert [r.name for r in results[-2:]] == ["hook_envs", "licenses"]
+    assert ran.count("poetry lock") == 8
+    for flags in product([False, True], repeat=3):
+        assert cache.is_offline_ready(variant_name(*flags))
+    # texts of common licenses are downloaded, unless they are bundled
+    assert "BSD-3-Clause" in downloaded and "MIT" not in downloaded
+
+    # nothing to do anymore
+    missing_hooks.clear()
+    ran.clear()
+    assert warm_cache() == []
+    assert ran == []
+
+
+def test_stale_locks(cache):
+    stale = cache.path / "locks" / "stale"
+    stale.mkdir(parents=True)
+    locks_dir = cache.locks()
+    assert not stale.exists()
+
+    shutil.rmtree(locks_dir)  # e.g. removed by another process
+    assert cache.lock_file("variant").parent == locks_dir
+    assert locks_dir.is_dir()
@@ -0,0 +1,54 @@
+import sqlite3
+
+from fair_python_cookiecutter.hookcache import (
+    HookRepo,
+    PreCommitConfig,
+    missing_hook_envs,
+    pre_commit_home,
+)
+
+
+def test_template_config():
+    repos = PreCommitConfig.load().pinned_repos()
+    assert repos
+    assert all(r.rev for r in repos)
+    somesy = "https://github.com/Materials-Data-Science-and-Informatics/somesy"
+    assert somesy in [r.repo for r in repos]
+
+
+def test_pre_commit_home(tmp_path, monkeypatch):
+    monkeypatch.delenv("PRE_COMMIT_HOME", raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert pre_commit_home() == tmp_path / "pre-commit"
+    monkeypatch.setenv("PRE_COMMIT_HOME", str(tmp_path / "custom"))
+    assert pre_commit_home() == tmp_path / "custom"
+
+
+def test_missing_hook_envs(tmp_path):
+    config = PreCommitConfig(
+        repos=[
+            HookRepo(repo="https://example.com/a", rev="v1"),
+            HookRepo(repo="https://example.com/b", rev="v2"),
+            HookRepo(repo="local"),
+        ]
+    )
+    all_missing = ["https://example.com/a@v1", "https://example.com/b@v2"]
+    assert missing_hook_envs(config, tmp_path) == all_missing
+
+    # same schema as used by pre-commit
+    db = sqlite3.connect(tmp_path / "db.db")
+    db.execute("CREATE TABLE repos (repo TEXT, ref TEXT, path TEXT)")
+    for repo, ref in [("a", "v1"), ("a", "v0"), ("b", "v2")]:
+        path = tmp_path / f"repo{repo}{ref}"
+        (path / "py_env-python3").mkdir(parents=True)
+        db.execute(
+            "INSERT INTO repos VALUES (?, ?, ?)",
+            (f"https://example.com/{repo}", ref, str(path)),
+        )
+    db.commit()
+    db.close()
+    # cloned, but environments not installed yet
+    assert missing_hook_envs(config, tmp_path) == all_missing
+
+    (tmp_path / "repoav1" / "py_env-python3" / ".install_state_v1").touch()
+    assert missing_hook_envs(config, tmp_path) == ["https://example.com/b@v2"]
@@ -0,0 +1,101 @@
+import pytest
+
+from fair_python_cookiecutter import licenses
+from fair_python_cookiecutter.licenses import COMMON_LICENSES, LicenseStore, license_ids
+from fair_python_cookiecutter.main import download_licenses
+from fair_python_cookiecutter.config import CookiecutterConfig
+from fair_python_cookiecutter.spdx import lookup_license
+
+REUSE_TOML = """
+version = 1
+
+[[annotations]]
+path = ["docs/**"]
+SPDX-License-Identifier = "CC0-1.0"
+
+[[annotations]]
+path = ["src/**"]
+SPDX-License-Identifier = "(MIT OR GPL-3.0-or-later WITH Classpath-exception-2.0)"
+
+[[annotations]]
+path = ["data/**"]
+SPDX-License-Identifier = "LicenseRef-custom AND MIT"
+"""
+
+
+def test_common_licenses():
+    assert all(lookup_license(i) == i for i in COMMON_LICENSES)
+
+
+def test_license_ids():
+    assert license_ids(REUSE_TOML) == [
+        "CC0-1.0",
+        "Classpath-exception-2.0",
+        "GPL-3.0-or-later",
+        "MIT",
+    ]
+
+
+@pytest.fixture
+def no_download(monkeypatch):
+    def fail(spdx_id):
+        raise RuntimeError(f"unexpected download of {spdx_id}")
+
+    monkeypatch.setattr(licenses, "fetch_license_text", fail)
+
+
+def test_store_bundled(tmp_path, no_download):
+    store = LicenseStore(tmp_path)
+    text = store.get("MIT")
+    assert text.startswith("MIT License")
+    # now it is served from the store
+    assert LicenseStore(tmp_path)._lookup("MIT") == text
+
+    # licenses suggested in the prompt and used in the examples need no download
+    for spdx_id in ["GPL-3.0-only", "GPL-3.0-or-later", "Unlicense", "MPL-2.0"]:
+        assert store.get(spdx_id)
+
+    assert not store.is_available("BSD-3-Clause")
+    with pytest.raises(KeyError):
+        store.get("BSD-3-Clause", download=False)
+    with pytest.raises(RuntimeError):
+        store.get("BSD-3-Clause")
+
+
+def test_store_download(tmp_path, monkeypatch):
+    downloaded = []
+
+    def fetch(spdx_id):
+        downloaded.append(spdx_id)
+        return f"text of {spdx_id}"
+
+    monkeypatch.setattr(licenses, "fetch_license_text", fetch)
+    store = LicenseStore(tmp_path)
+    assert store.get("BSD-3-Clause") == "text of BSD-3-Clause"
+    assert store.get("BSD-3-Clause") == "text of BSD-3-Clause"
+    assert downloaded == ["BSD-3-Clause"]
+    assert store.is_available("BSD-3-Clause")
+
+    # corrupted objects are detected and replaced
+    for obj in (tmp_path / "objects").iterdir():
+        obj.write_text("corrupted")
+    assert store.get("BSD-3-Clause") == "text of BSD-3-Clause"
+    assert downloaded == ["BSD-3-Clause", "BSD-3-Clause"]
+
+
+def test_download_licenses(tmp_path, monkeypatch, no_download):
+    monkeypatch.setattr(licenses, "user_cache_dir", lambda: tmp_path / "cache")
+    proj_root = tmp_path / "proj"
+    proj_root.mkdir()
+    (proj_root / "temp-REUSE.toml").write_text(
+        'SPDX-License-Identifier = "CC0-1.0"\nSPDX-License-Identifier = "MIT"\n'
+    )
+
+    download_licenses(proj_root, CookiecutterConfig())
+
+    assert (proj_root / "REUSE.toml").is_file()
+    assert sorted(p.name for p in (proj_root / "LICENSES").iterdir()) == [
+        "CC0-1.0.txt",
+        "MIT.txt",
+    ]
+    assert (proj_root / "LICENSE").read_text().startswith("MIT License")
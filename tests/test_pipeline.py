@@ -0,0 +1,108 @@
+import sys
+import threading
+
+import pytest
+
+from fair_python_cookiecutter import depcache, main
+from fair_python_cookiecutter.config import CookiecutterConfig
+from fair_python_cookiecutter.pipeline import Pipeline, PipelineError
+
+
+def test_pipeline_concurrent(tmp_path):
+    # both steps must run at the same time to pass the barrier
+    barrier = threading.Barrier(2, timeout=5)
+    done = []
+    pipeline = Pipeline(tmp_path)
+    pipeline.add("a", barrier.wait)
+    pipeline.add("b", barrier.wait)
+    pipeline.add("c", lambda: done.append("c"), needs=["a", "b"])
+
+    results = pipeline.run()
+    assert [(r.name, r.status) for r in results] == [
+        ("a", "ok"),
+        ("b", "ok"),
+        ("c", "ok"),
+    ]
+    assert done == ["c"]
+
+
+def test_pipeline_errors(tmp_path):
+    fail = [sys.executable, "-c", "print('oops'); exit(3)"]
+    pipeline = Pipeline(tmp_path)
+    pipeline.add("optional", cmds=[fail], may_fail=True)
+    pipeline.add("after_optional", lambda: None, needs=["optional"])
+    pipeline.add("required", cmds=[fail])
+    pipeline.add("after_required", lambda: None, needs=["required"])
+    pipeline.add("transitive", lambda: None, needs=["after_required"])
+    pipeline.add("independent", lambda: None)
+
+    with pytest.raises(PipelineError) as exc:
+        pipeline.run()
+    status = {r.name: r.status for r in exc.value.results}
+    assert status == {
+        "optional": "warning",
+        "after_optional": "ok",
+        "required": "failed",
+        "after_required": "skipped",
+        "transitive": "skipped",
+        "independent": "ok",
+    }
+    failed = next(r for r in exc.value.results if r.name == "required")
+    assert "exited with code 3" in failed.error
+    assert "oops" in failed.error
+    assert "after_required, transitive" in str(exc.value)
+
+
+def test_pipeline_name(tmp_path, capsys):
+    pipeline = Pipeline(tmp_path, name="my-project")
+    pipeline.add("a", lambda: None)
+    pipeline.run()
+    assert capsys.readouterr().out == "[my-project] Finished: a\n"
+
+
+def test_pipeline_invalid(tmp_path):
+    pipeline = Pipeline(tmp_path)
+    pipeline.add("a", lambda: None)
+    with pytest.raises(ValueError):
+        pipeline.add("a", lambda: None)
+    with pytest.raises(ValueError):
+        pipeline.add("b", lambda: None, needs=["c"])
+    with pytest.raises(ValueError):
+        pipeline.add("b")
+
+
+def test_post_gen_pipeline(tmp_path, monkeypatch):
+    ran = []
+
+    def run_cmd(self, cmd, **_):
+        ran.append(cmd)
+        if cmd == "poetry install --with docs":
+            (tmp_path / "poetry.lock").write_text("# lock")
+
+    monkeypatch.setattr(Pipeline, "run_cmd", run_cmd)
+    monkeypatch.setattr(main, "download_licenses", lambda *_: ran.append("licenses"))
+    monkeypatch.setattr(main, "record_committed", lambda *_: ran.append("record"))
+    monkeypatch.setattr(depcache, "user_cache_dir", lambda: tmp_path / "cache")
+    monkeypatch.setattr(main, "missing_hook_envs", lambda: ["repo@rev"])
+
+    pipeline = main.post_gen_pipeline(tmp_path, CookiecutterConfig())
+    assert "hook_envs" in pipeline.steps["somesy"].needs
+    results = pipeline.run()
+    assert all(r.status == "ok" for r in results)
+    # commit happens after all files were created and staged
+    assert ran.index("licenses") < ran.index("git add .")
+    # hashes of files modified by the hooks are recorded (and committed)
+    assert ran[-4:-2] == ["record", "git add ."]
+    assert ran[-2][:4] == ["poetry", "run", "git", "commit"]
+    assert ran[-1] == "git branch -M main"
+    # the lock file was cached for the next project
+    lock_file = depcache.DependencyCache().lock_file("cli-0_api-0_bench-0")
+    assert lock_file.read_text() == "# lock"
+
+
+def test_post_gen_pipeline_hooks_ready(tmp_path, monkeypatch):
+    monkeypatch.setattr(depcache, "user_cache_dir", lambda: tmp_path / "cache")
+    monkeypatch.setattr(main, "missing_hook_envs", lambda: [])
+    pipeline = main.post_gen_pipeline(tmp_path, CookiecutterConfig())
+    assert "hook_envs" not in pipeline.steps
+    assert pipeline.steps["somesy"].needs == ["stage"]
@@ -0,0 +1,102 @@
+from pathlib import Path
+
+from fair_python_cookiecutter.config import CookiecutterConfig, CookiecutterJson
+from fair_python_cookiecutter.main import preview_repository, remove_unneeded_code
+from fair_python_cookiecutter.preview import ProjectManifest, diff_project
+from fair_python_cookiecutter.render import RenderedFile
+from fair_python_cookiecutter.state import file_hash
+from fair_python_cookiecutter.utils import render_template
+
+
+def test_manifest():
+    files = {
+        "b.txt": RenderedFile(b"second\n", 0o644),
+        "a/run.sh": RenderedFile(b"#!/bin/sh\n", 0o755),
+    }
+    manifest = ProjectManifest.from_files(Path("out/proj"), files)
+    assert [e.path for e in manifest.files] == ["a/run.sh", "b.txt"]
+    assert manifest.files[0].mode == "0755"
+    assert manifest.files[1].sha256 == file_hash(b"second\n")
+    assert manifest.total_size() == 17
+
+
+def test_diff_project(tmp_path):
+    files = {
+        "same.txt": RenderedFile(b"same\n", 0o644),
+        "changed.txt": RenderedFile(b"one\ntwo\n", 0o644),
+        "new.txt": RenderedFile(b"new", 0o644),
+        "image.bin": RenderedFile(b"\xff\x00", 0o644),
+    }
+    (tmp_path / "same.txt").write_bytes(b"same\n")
+    (tmp_path / "changed.txt").write_bytes(b"one\n")
+    (tmp_path / "image.bin").write_bytes(b"\xff\x01")
+    (tmp_path / "other.txt").write_bytes(b"not generated")
+
+    diff = diff_project(files, tmp_path)
+    assert "same.txt" not in diff and "other.txt" not in diff
+    assert "--- a/changed.txt\n+++ b/changed.txt\n" in diff
+    assert "\n+two\n" in diff
+    assert "--- /dev/null\n+++ b/new.txt\n" in diff
+    assert "Binary files a/image.bin and b/image.bin differ\n" in diff
+
+    assert diff_project({"same.txt": files["same.txt"]}, tmp_path) == ""
+
+
+def test_preview_repository(tmp_path):
+    conf = CookiecutterConfig.load(config_file="./tests/demo.yaml")
+    conf.fair_python_cookiecutter.infer_from_repo_url(
+        "https://github.com/MyOrg/my-project"
+    )
+    conf.fair_python_cookiecutter.init_cli = False
+    repo_dir, files = preview_repository(conf, tmp_path)
+
+    assert repo_dir == tmp_path / "my-project"
+    assert not list(tmp_path.iterdir())  # nothing was written
+    assert "pyproject.toml" in files and "REUSE.toml" in files
+    assert "src/my_project/cli.py" not in files
+    assert ".gitlab/issue_templates/bug_report.md" in files
+
+
+def test_benchmarks_of_included_code(tmp_path):
+    conf = CookiecutterConfig.load(config_file="./tests/demo.yaml")
+    conf.fair_python_cookiecutter.infer_from_repo_url(
+        "https://github.com/MyOrg/my-project"
+    )
+    conf.fair_python_cookiecutter.init_api = False
+    conf.fair_python_cookiecutter.init_bench = True
+    _, files = preview_repository(conf, tmp_path)
+    benchmarks = sorted(p for p in files if p.startswith("benchmarks/"))
+    assert benchmarks == [
+        "benchmarks/__init__.py",
+        "benchmarks/conftest.py",
+        "benchmarks/test_cli.py",
+        "benchmarks/test_lib.py",
+    ]
+    assert "pytest-benchmark" in files["pyproject.toml"].content.decode()
+
+    # without benchmarks, the directory is removed completely
+    conf.fair_python_cookiecutter.init_bench = False
+    _, files = preview_repository(conf, tmp_path)
+    assert not any(p.startswith("benchmarks/") for p in files)
+    assert "pytest-benchmark" not in files["pyproject.toml"].content.decode()
+
+    proj_dir = render_template(CookiecutterJson.from_config(conf), tmp_path)
+    remove_unneeded_code(proj_dir, conf)
+    assert not (proj_dir / "benchmarks").exists()
+    assert (proj_dir / "tests").is_dir()
+
+
+def test_profiling_option(tmp_path):
+    conf = CookiecutterConfig.load(config_file="./tests/demo.yaml")
+    conf.fair_python_cookiecutter.infer_from_repo_url(
+        "https://github.com/MyOrg/my-project"
+    )
+    _, files = preview_repository(conf, tmp_path)
+    assert "scripts/profiling.py" not in files and "docs/profiling.md" not in files
+    assert "profiling.md" not in files["mkdocs.yml"].content.decode()
+
+    conf.fair_python_cookiecutter.init_profiling = True
+    _, files = preview_repository(conf, tmp_path)
+    assert "scripts/profiling.py" in files and "docs/profiling.md" in files
+    assert "profiling.md" in files["mkdocs.yml"].content.decode()
+    assert "importtime = " in files["pyproject.toml"].content.decode()
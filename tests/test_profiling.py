@@ -0,0 +1,99 @@
+import json
+import pstats
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+import pytest
+
+from fair_python_cookiecutter import profiling
+from fair_python_cookiecutter.profiling import Profiler
+
+
+def test_phases(tmp_path):
+    prof = Profiler()
+    with prof.phase("outer"):
+        with prof.phase("inner"):
+            pass
+    assert [(p.name, p.depth) for p in prof.phases] == [("outer", 0), ("inner", 1)]
+    assert prof.phases[0].wall >= prof.phases[1].wall
+
+    report = tmp_path / "profile.json"
+    prof.save_report(report)
+    assert [p["name"] for p in json.loads(report.read_text())] == ["outer", "inner"]
+
+    with pytest.raises(RuntimeError):
+        prof.save_stats(tmp_path / "profile.prof")
+
+
+def test_active_profiler():
+    with profiling.phase("ignored"):
+        pass  # no-op without an active profiler
+
+    prof = Profiler()
+    with profiling.activate(prof):
+        assert profiling.active() is prof
+        with profiling.phase("measured"):
+            pass
+    assert profiling.active() is None
+    assert [p.name for p in prof.phases] == ["measured"]
+
+
+def test_phases_in_threads():
+    prof = Profiler()
+
+    def work(name):
+        with prof.phase(name):
+            pass
+
+    with prof.phase("outer"), ThreadPoolExecutor(2) as pool:
+        for name in ["a", "b"]:
+            pool.submit(copy_context().run, work, name).result()
+    assert [(p.name, p.depth) for p in prof.phases] == [
+        ("outer", 0),
+        ("a", 1),
+        ("b", 1),
+    ]
+
+
+def test_concurrent_phases():
+    prof = Profiler()
+    # both phases must run at the same time to pass the barrier
+    barrier = threading.Barrier(2, timeout=5)
+
+    def work(name):
+        with prof.phase(name):
+            barrier.wait()
+
+    with prof.phase("outer"), ThreadPoolExecutor(2) as pool:
+        for future in [pool.submit(copy_context().run, work, n) for n in "ab"]:
+            future.result()
+    with prof.phase("after"):
+        pass
+
+    phases = {p.name: p for p in prof.phases}
+    # process-wide CPU times are only reported for phases without overlap
+    assert phases["a"].concurrent and phases["a"].cpu is None
+    assert phases["b"].concurrent and phases["b"].cpu is None
+    assert not phases["outer"].concurrent and phases["outer"].cpu is not None
+    assert not phases["after"].concurrent and phases["after"].cpu is not None
+
+
+def busy_step():
+    return sum(range(1000))
+
+
+def test_stats_of_threads(tmp_path):
+    prof = Profiler(cprofile=True)
+
+    def work():
+        with prof.phase("step"):
+            busy_step()
+
+    with prof.phase("outer"), ThreadPoolExecutor(1) as pool:
+        pool.submit(copy_context().run, work).result()
+
+    stats_file = tmp_path / "profile.prof"
+    prof.save_stats(stats_file)
+    functions = {func for _, _, func in pstats.Stats(str(stats_file)).stats}
+    assert "busy_step" in functions
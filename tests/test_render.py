@@ -0,0 +1,33 @@
+import os
+
+import pytest
+
+from fair_python_cookiecutter.config import CookiecutterConfig, CookiecutterJson
+from fair_python_cookiecutter.render import render_project
+from fair_python_cookiecutter.utils import render_template
+
+
+@pytest.mark.parametrize("init_code", [False, True])
+def test_render_project_like_cookiecutter(tmp_path, init_code):
+    conf = CookiecutterConfig.load(config_file="./tests/demo.yaml")
+    conf.fair_python_cookiecutter.infer_from_repo_url(
+        "https://github.com/MyOrg/my-project"
+    )
+    conf.fair_python_cookiecutter.init_cli = init_code
+    conf.fair_python_cookiecutter.init_api = init_code
+    cc_json = CookiecutterJson.from_config(conf)
+
+    name, files = render_project(cc_json)
+    proj_dir = render_template(cc_json, tmp_path)
+    assert name == proj_dir.name
+
+    on_disk = {}
+    for root, _, filenames in os.walk(proj_dir):
+        for f in filenames:
+            path = os.path.join(root, f)
+            on_disk[os.path.relpath(path, proj_dir).replace(os.sep, "/")] = (
+                open(path, "rb").read(),
+                os.stat(path).st_mode & 0o777,
+            )
+    assert sorted(files) == sorted(on_disk)
+    assert {p: tuple(f) for p, f in files.items()} == on_disk
@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+from fair_python_cookiecutter.config import FPCConfig
+from fair_python_cookiecutter.spdx import (
+    build_index,
+    license_index,
+    lookup_license,
+    suggest_licenses,
+)
+
+
+def test_lookup_license():
+    assert lookup_license("MIT") == "MIT"
+    assert lookup_license(" gpl-3.0-only ") == "GPL-3.0-only"
+    assert lookup_license("apache-2.0") == "Apache-2.0"
+    assert lookup_license("NOT-A-LICENSE") is None
+
+
+def test_suggest_licenses():
+    assert suggest_licenses("") == []
+    # prefix matches come first
+    assert suggest_licenses("apache")[:2] == ["Apache-1.0", "Apache-1.1"]
+    assert len(suggest_licenses("gpl", n=3)) == 3
+    # typos are matched approximately
+    assert "Apache-2.0" in suggest_licenses("Apahce-2.0")
+    assert suggest_licenses("zzzzzzzz") == []
+
+
+def test_build_index():
+    licenses = [{"licenseId": "mit-0"}, {"licenseId": "MIT"}, {"licenseId": "Zlib"}]
+    index = build_index(json.dumps({"licenses": licenses}))
+    assert index == "MIT\nmit-0\nZlib\n"
+    # bundled index is in the same format
+    ids = list(license_index().values())
+    assert ids == sorted(ids, key=str.lower)
+
+
+def test_validate_license():
+    conf = FPCConfig()
+    conf.project_license = "bsd-3-clause"
+    assert conf.project_license == "BSD-3-Clause"
+
+    with pytest.raises(ValueError, match="Did you mean: .*GPL-3.0"):
+        conf.project_license = "GPL3.0"
@@ -0,0 +1,56 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+# modules that must not be loaded just to start the CLI
+HEAVY_MODULES = [
+    "cookiecutter",
+    "pydantic",
+    "pydantic_yaml",
+    "fair_python_cookiecutter.spdx",
+    "importlib_resources",
+    "fair_python_cookiecutter.config",
+    "fair_python_cookiecutter.main",
+]
+
+# budget for importing the CLI module (can be overridden, e.g. for slow machines)
+STARTUP_BUDGET_MS = float(os.environ.get("FPC_STARTUP_BUDGET_MS", 100))
+
+
+def importtime(code: str):
+    """Run code in a fresh interpreter, return import times (in ms) by module."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+@pytest.mark.parametrize("args", [[], ["--help"], ["--version"]])
+def test_no_heavy_imports(args):
+    code = "from fair_python_cookiecutter.cli import app\n"
+    if args:
+        code += f"app({args!r})"
+    loaded = importtime(code)
+    assert not [m for m in HEAVY_MODULES if m in loaded]
+
+
+def test_startup_time():
+    # take the best of a few runs to reduce noise
+    best = min(
+        importtime("import fair_python_cookiecutter.cli")[
+            "fair_python_cookiecutter.cli"
+        ]
+        for _ in range(3)
+    )
+    assert best < STARTUP_BUDGET_MS, f"CLI startup took {best:.1f} ms"
@@ -0,0 +1,150 @@
+import pytest
+
+from fair_python_cookiecutter import depcache, licenses, main
+from fair_python_cookiecutter.config import CookiecutterConfig, CookiecutterJson
+from fair_python_cookiecutter.main import (
+    record_committed,
+    record_state,
+    update_repository,
+)
+from fair_python_cookiecutter.pipeline import Pipeline
+from fair_python_cookiecutter.state import ProjectState, file_hash
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """Generated project (without the post-generation steps)."""
+    ran = []
+    monkeypatch.setattr(Pipeline, "run_cmd", lambda self, cmd, **_: ran.append(cmd))
+    monkeypatch.setattr(main, "missing_hook_envs", lambda: [])
+    for mod in [licenses, depcache]:
+        monkeypatch.setattr(mod, "user_cache_dir", lambda: tmp_path / "cache")
+
+    conf = CookiecutterConfig.load(config_file="./tests/demo.yaml")
+    conf.fair_python_cookiecutter.infer_from_repo_url(
+        "https://github.com/MyOrg/my-project"
+    )
+    conf.fair_python_cookiecutter.project_license = "MIT"
+    proj_root = main.render_template(CookiecutterJson.from_config(conf), tmp_path)
+    main.create_gl_issue_template_from_gh(proj_root)
+    main.remove_unneeded_code(proj_root, conf)
+    record_state(proj_root, CookiecutterJson.from_config(conf))
+    (proj_root / "temp-REUSE.toml").rename(proj_root / "REUSE.toml")
+    (proj_root / ".git").mkdir()
+    return proj_root, ran
+
+
+def pretend_generated(proj_root, path, content: str):
+    """Change state so that the file looks like generated from an older template."""
+    state = ProjectState.load(proj_root)
+    state.files[path] = file_hash(content.encode())
+    state.save(proj_root)
+
+
+def test_update_unchanged(project):
+    proj_root, ran = project
+    state = (proj_root / ".fair-python-cookiecutter.json").read_text()
+    res = update_repository(proj_root)
+    assert res.changed() == [] and res.conflicts == [] and res.steps == []
+    assert ran == []
+    assert (proj_root / ".fair-python-cookiecutter.json").read_text() == state
+
+
+def test_update(project):
+    proj_root, ran = project
+    # template changed, file was not modified in the project
+    expected = (proj_root / "pyproject.toml").read_text()
+    (proj_root / "pyproject.toml").write_text("old")
+    pretend_generated(proj_root, "pyproject.toml", "old")
+    # template changed, file was also modified in the project
+    (proj_root / "README.md").write_text("my readme")
+    pretend_generated(proj_root, "README.md", "old readme")
+    # file was removed from the template
+    (proj_root / "obsolete.txt").write_text("old")
+    pretend_generated(proj_root, "obsolete.txt", "old")
+    # file was added to the template
+    (proj_root / "AUTHORS.md").unlink()
+    state = ProjectState.load(proj_root)
+    del state.files["AUTHORS.md"]
+    state.save(proj_root)
+
+    res = update_repository(proj_root, dry_run=True)
+    assert res.changed() == ["AUTHORS.md", "obsolete.txt", "pyproject.toml"]
+    assert (proj_root / "pyproject.toml").read_text() == "old"
+    assert ran == []
+
+    res = update_repository(proj_root)
+    assert res.added == ["AUTHORS.md"]
+    assert res.updated == ["pyproject.toml"]
+    assert res.removed == ["obsolete.txt"]
+    assert res.conflicts == ["README.md"]
+    assert res.steps == ["poetry_lock", "poetry_install"]
+    assert ran == ["poetry lock", "poetry install --with docs"]
+
+    assert (proj_root / "pyproject.toml").read_text() == expected
+    assert (proj_root / "AUTHORS.md").is_file()
+    assert not (proj_root / "obsolete.txt").exists()
+    assert (proj_root / "README.md").read_text() == "my readme"
+
+    # conflict is still reported, everything else is up to date
+    ran.clear()
+    res = update_repository(proj_root)
+    assert res.changed() == [] and res.conflicts == ["README.md"]
+    assert ran == []
+
+
+def test_update_after_hooks(project):
+    proj_root, _ = project
+    # post-generation steps (e.g. formatters) modified generated files
+    readme = (proj_root / "README.md").read_text() + "formatted\n"
+    (proj_root / "README.md").write_text(readme)
+    (proj_root / "CHANGELOG.md").write_text("formatted")
+    record_committed(proj_root)
+    assert sorted(ProjectState.load(proj_root).committed) == [
+        "CHANGELOG.md",
+        "README.md",
+    ]
+
+    res = update_repository(proj_root)
+    assert res.changed() == [] and res.conflicts == []
+    assert (proj_root / "README.md").read_text() == readme
+
+    # files changed by the hooks are still updated if the template changed
+    pretend_generated(proj_root, "CHANGELOG.md", "old")
+    res = update_repository(proj_root)
+    assert res.updated == ["CHANGELOG.md"] and res.conflicts == []
+    assert sorted(ProjectState.load(proj_root).committed) == ["README.md"]
+
+    # but changes made afterwards are detected
+    (proj_root / "README.md").write_text("my readme")
+    pretend_generated(proj_root, "README.md", "old readme")
+    res = update_repository(proj_root)
+    assert res.changed() == [] and res.conflicts == ["README.md"]
+
+
+def test_update_licenses(project):
+    proj_root, _ = project
+    (proj_root / "REUSE.toml").write_text("old")
+    pretend_generated(proj_root, "REUSE.toml", "old")
+
+    res = update_repository(proj_root)
+    assert res.steps == ["licenses"]
+    assert (proj_root / "LICENSES" / "MIT.txt").is_file()
+    assert (proj_root / "LICENSE").read_text().startswith("MIT License")
+
+
+def test_update_not_generated(tmp_path):
+    with pytest.raises(ValueError):
+        update_repository(tmp_path)
+
+
+def test_update_old_state(project):
+    proj_root, _ = project
+    # state of a project generated before a template variable was added
+    state = ProjectState.load(proj_root)
+    del state.cookiecutter["init_profiling"]
+    state.save(proj_root)
+
+    res = update_repository(proj_root)
+    assert res.changed() == [] and res.conflicts == []
+    assert ProjectState.load(proj_root).cookiecutter["init_profiling"] is False
@@ -1,5 +1,14 @@
 import json
-from fair_python_cookiecutter.utils import TempDir, copy_template
+import os
+import shutil
+from fair_python_cookiecutter import __version__, utils
+from fair_python_cookiecutter.config import CookiecutterJson
+from fair_python_cookiecutter.utils import (
+    TEMPLATE_DIR,
+    TempDir,
+    deactivated_venv_env,
+    render_template,
+)
 
 import pytest
 
@@ -32,13 +41,69 @@ def test_tempdir(tmp_path):
         dir = TempDir(tmp_path / "invalid")
 
 
-def test_copy_template(tmp_path):
-    with TempDir(tmp_path, keep=True) as tmp_dir:
-        cc_json = tmp_dir / "cookiecutter.json"
-        copy_template(tmp_dir)
-        assert (cc_json).is_file()
+def test_render_template(tmp_path):
+    with open(TEMPLATE_DIR / "cookiecutter.json", "r") as f:
+        cc_json = CookiecutterJson.model_validate(json.load(f))
+    cc_json.project_slug = "my-project"
 
-        # check that field names are dumped by alias
-        with open(cc_json, "r") as f:
-            jsondata = json.load(f)
-            assert "_copy_without_render" in jsondata
+    proj_dir = render_template(cc_json, tmp_path)
+
+    # rendered directly into the output directory, no cookiecutter.json written
+    assert proj_dir == tmp_path / "my-project"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["my-project"]
+    assert "my-project" in (proj_dir / "pyproject.toml").read_text()
+
+
+def test_deactivated_venv_env(tmp_path, monkeypatch):
+    venv_bin = tmp_path / "venv" / ("Scripts" if os.name == "nt" else "bin")
+    monkeypatch.setenv("VIRTUAL_ENV", str(venv_bin.parent))
+    monkeypatch.setenv("PATH", os.pathsep.join([str(venv_bin), str(tmp_path)]))
+
+    env = deactivated_venv_env()
+    assert "VIRTUAL_ENV" not in env
+    assert env["PATH"] == str(tmp_path)
+
+
+def test_jinja_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, "user_cache_dir", lambda: tmp_path / "cache")
+    stale = tmp_path / "cache" / "jinja" / "0.0.0-stale"
+    stale.mkdir(parents=True)
+
+    with open(TEMPLATE_DIR / "cookiecutter.json", "r") as f:
+        cc_json = CookiecutterJson.model_validate(json.load(f))
+    cc_json.project_slug = "my-project"
+    render_template(cc_json, tmp_path / "out1")
+
+    # compiled templates are stored, caches for other versions are removed
+    cache_dir = utils.jinja_cache_dir()
+    assert cache_dir.name.startswith(f"{__version__}-{utils.template_hash()[:16]}")
+    assert len(list(cache_dir.iterdir())) > 0
+    assert not stale.exists()
+
+    # result is the same when using the cache
+    render_template(cc_json, tmp_path / "out2")
+    pyproject = "my-project/pyproject.toml"
+    assert (tmp_path / "out1" / pyproject).read_text() == (
+        tmp_path / "out2" / pyproject
+    ).read_text()
+
+
+def test_template_hash_independent_of_location(tmp_path, monkeypatch):
+    expected = utils.template_hash()
+    shutil.copytree(TEMPLATE_DIR, tmp_path / "template")
+    monkeypatch.setattr(utils, "TEMPLATE_DIR", tmp_path / "template")
+    utils.template_hash.cache_clear()
+    try:
+        assert utils.template_hash() == expected
+    finally:
+        utils.template_hash.cache_clear()
+
+
+def test_jinja_cache_recreated(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, "user_cache_dir", lambda: tmp_path / "cache")
+    cache_dir = utils.jinja_cache_dir()
+    (cache_dir / "compiled").write_text("")
+    shutil.rmtree(cache_dir)  # e.g. removed by another process
+
+    assert utils.jinja_cache_dir() == cache_dir
+    assert cache_dir.is_dir()